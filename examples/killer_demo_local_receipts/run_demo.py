@@ -10,32 +10,34 @@ import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
 
 def _repo_root() -> Path:
-    return Path(__file__).resolve().parents[2]
+    return _REPO_ROOT
 
 
 def _run_boundary_check(repo_root: Path) -> None:
     script_path = repo_root / "scripts" / "verify_public_boundary.sh"
-    completed = subprocess.run(
+    # Stream the script's output as it runs instead of buffering it all.
+    with subprocess.Popen(
         ["bash", str(script_path)],
         cwd=repo_root,
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         text=True,
-        check=False,
-    )
-    if completed.returncode != 0:
-        print(completed.stdout)
-        print(completed.stderr)
+    ) as proc:
+        for line in proc.stdout:
+            sys.stdout.write(line)
+    if proc.returncode != 0:
         raise RuntimeError("Boundary verification failed. See output above.")
     print("PASS: boundary verified")
 
 
 def _demo_flow(receipt_dir: Path) -> Path:
-    repo_root = _repo_root()
-    if str(repo_root) not in sys.path:
-        sys.path.insert(0, str(repo_root))
-
+    from src.fast_json import as_dict
     from src.orchestrator import Orchestrator
     from src.tracer import TraceStore
 
@@ -55,16 +57,20 @@ def _demo_flow(receipt_dir: Path) -> Path:
     orchestrator = Orchestrator()
     messages = [{"role": "user", "content": "calc 2 + 2"}]
     result = orchestrator.handle(messages)
+    route_decision = result.get("route_decision")
 
-    if handle:
-        tracer.record_step(
-            handle.trace_id,
-            "demo_step",
-            {
+    # Buffer demo steps and flush them in a single transaction.
+    pending_steps = [
+        {
+            "step_type": "demo_step",
+            "payload": {
                 "assistant_content": result["assistant_content"],
-                "route_decision": getattr(result.get("route_decision"), "__dict__", None),
+                "route_decision": as_dict(route_decision) if route_decision else None,
             },
-        )
+        }
+    ]
+    if handle:
+        tracer.record_steps(handle.trace_id, pending_steps)
 
     receipt_path = receipt_dir / "demo_receipt.json"
     receipt_payload = {
@@ -81,10 +87,6 @@ def _demo_flow(receipt_dir: Path) -> Path:
 
 
 def _simulate_exfiltration_block() -> None:
-    repo_root = _repo_root()
-    if str(repo_root) not in sys.path:
-        sys.path.insert(0, str(repo_root))
-
     from src.tool_registry import ToolRegistry, ToolSpec
 
     os.environ["ORCH_TOOL_POLICY_ENFORCE"] = "1"
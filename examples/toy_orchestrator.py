@@ -21,41 +21,83 @@ Philosophy alignment:
 
 import json
 import os
+import re
 import sys
-from typing import Dict, List, Any
-from datetime import datetime
+import time
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional
+from datetime import datetime, timezone
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from src.router import RuleRouter, Rule
+from src.router import RouteDecision, RuleRouter, Rule
 from src.tool_registry import ToolRegistry, ToolSpec
 from src.tools.math import evaluate_expression, SafeMathError
 
 
+def _iso(ts_ns: int) -> str:
+    """Format a time.time_ns() stamp; only done when a caller reads it."""
+    # Integer split: ts_ns / 1e9 loses microseconds to float rounding.
+    secs, ns = divmod(ts_ns, 10**9)
+    return datetime.fromtimestamp(secs, tz=timezone.utc).replace(microsecond=ns // 1000).isoformat()
+
+
 class ToyMemory:
     """Bounded conversation memory (max 10 messages)"""
     
     def __init__(self, max_messages: int = 10):
-        self.messages: List[Dict[str, str]] = []
+        self.messages: Deque[Dict[str, str]] = deque(maxlen=max_messages)
         self.max_messages = max_messages
     
     def add(self, role: str, content: str) -> None:
         """Add message and enforce bound"""
-        self.messages.append({"role": role, "content": content, "timestamp": datetime.utcnow().isoformat()})
-        if len(self.messages) > self.max_messages:
-            # Forget oldest (bounded memory principle)
-            self.messages.pop(0)
+        if len(self.messages) == self.max_messages:
+            # deque(maxlen=...) drops the oldest on append (bounded memory principle)
             print(f"  🗑️  [Memory] Forgot oldest message (cap: {self.max_messages})")
+        self.messages.append({"role": role, "content": content, "ts_ns": time.time_ns()})
     
     def get_recent(self, n: int = 5) -> List[Dict[str, str]]:
         """Retrieve last N messages"""
-        return self.messages[-n:]
+        return [
+            {"role": msg["role"], "content": msg["content"], "timestamp": _iso(msg["ts_ns"])}
+            for msg in islice(self.messages, max(0, len(self.messages) - n), None)
+        ]
     
     def summary(self) -> str:
         """Memory receipt"""
         return f"{len(self.messages)}/{self.max_messages} messages"
 
 
+_MATH_RE = re.compile(r"calculate|math|[+\-*/]")
+_ECHO_RE = re.compile(r"echo|repeat|say")
+
+# Both rules' keywords in one alternation; the group name is the tool.
+# Group order mirrors rule registration order (first rule wins).
+_TOOL_PRIORITY = ("calculator", "echo")
+_KEYWORD_RE = re.compile(f"(?P<calculator>{_MATH_RE.pattern})|(?P<echo>{_ECHO_RE.pattern})")
+
+
+def _match_tool(text: str) -> Optional[str]:
+    """Single scan over the input; returns the highest-priority tool hit."""
+    best: Optional[int] = None
+    for match in _KEYWORD_RE.finditer(text.lower()):
+        rank = _TOOL_PRIORITY.index(match.lastgroup)
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+    return None if best is None else _TOOL_PRIORITY[best]
+
+
+def _is_math(text: str) -> bool:
+    return _MATH_RE.search(text.lower()) is not None
+
+
+def _is_echo(text: str) -> bool:
+    return _ECHO_RE.search(text.lower()) is not None
+
+
 def calculator(expression: str) -> str:
     """Evaluate math expression using AST-safe evaluator."""
     try:
@@ -80,10 +122,11 @@ class ToyOrchestrator:
         self.tools.register(ToolSpec(name="echo", description="Echo message back", handler=echo))
 
         self.router = RuleRouter()
-        self.router.add_rule(
+        self._rules_by_tool: Dict[str, Rule] = {}
+        self._add_rule(
             Rule(
                 tool="calculator",
-                predicate=lambda text: any(word in text.lower() for word in ["calculate", "math", "+", "-", "*", "/"]),
+                predicate=_is_math,
                 param_builder=lambda text: {
                     "expression": text.split("calculate")[-1].strip()
                     if "calculate" in text.lower()
@@ -93,10 +136,10 @@ class ToyOrchestrator:
                 reason="keyword_math",
             )
         )
-        self.router.add_rule(
+        self._add_rule(
             Rule(
                 tool="echo",
-                predicate=lambda text: any(word in text.lower() for word in ["echo", "repeat", "say"]),
+                predicate=_is_echo,
                 param_builder=lambda text: {
                     "message": text.split("echo")[-1].strip()
                     if "echo" in text.lower()
@@ -108,6 +151,23 @@ class ToyOrchestrator:
         )
         self.trace: List[Dict[str, Any]] = []
     
+    def _add_rule(self, rule: Rule) -> None:
+        self.router.add_rule(rule)
+        self._rules_by_tool[rule.tool] = rule
+    
+    def _route(self, user_input: str) -> RouteDecision:
+        """Dispatch on one combined keyword scan; per-rule predicates are the fallback."""
+        tool = _match_tool(user_input)
+        rule = self._rules_by_tool.get(tool) if tool else None
+        if rule is None:
+            return self.router.route(user_input)
+        return RouteDecision(
+            tool=rule.tool,
+            params=rule.param_builder(user_input),
+            confidence=rule.confidence,
+            reason=rule.reason,
+        )
+    
     def process(self, user_input: str) -> str:
         """
         Orchestration loop:
@@ -124,7 +184,7 @@ class ToyOrchestrator:
         self.memory.add("user", user_input)
         
         # Step 2: Route
-        routing_decision = self.router.route(user_input)
+        routing_decision = self._route(user_input)
         self._add_trace("routing", {
             "tool": routing_decision.tool,
             "params": routing_decision.params,
@@ -159,20 +219,23 @@ class ToyOrchestrator:
     def _add_trace(self, event_type: str, data: Dict[str, Any]) -> None:
         """Add event to trace (receipts principle)"""
         self.trace.append({
-            "timestamp": datetime.utcnow().isoformat(),
+            "ts_ns": time.time_ns(),
             "event": event_type,
             "data": data
         })
     
     def get_trace(self) -> List[Dict[str, Any]]:
         """Return full trace (receipts over assertions)"""
-        return self.trace
+        return [
+            {"timestamp": _iso(event["ts_ns"]), "event": event["event"], "data": event["data"]}
+            for event in self.trace
+        ]
     
     def print_trace_summary(self) -> None:
         """Print trace summary"""
         print("\n📋 Trace Summary:")
         for i, event in enumerate(self.trace, 1):
-            print(f"  [{i}] {event['event']} @ {event['timestamp']}")
+            print(f"  [{i}] {event['event']} @ {_iso(event['ts_ns'])}")
 
 
 def interactive_demo():
@@ -22,16 +22,14 @@ def convert_crewai_spec(spec: Dict[str, object]) -> List[TaskSpec]:
       ]
     }
     """
-    tasks: List[TaskSpec] = []
     if not isinstance(spec, dict):
-        return tasks
+        return []
 
     raw_tasks = spec.get("tasks", []) or []
-    for entry in raw_tasks:
-        if not isinstance(entry, dict):
-            continue
-        tool = entry.get("tool")
-        when = entry.get("when") or entry.get("condition")
-        if tool and when:
-            tasks.append(TaskSpec(tool=str(tool), when=str(when)))
-    return tasks
+    return [
+        TaskSpec(tool=str(entry["tool"]), when=str(when))
+        for entry in raw_tasks
+        if isinstance(entry, dict)
+        and entry.get("tool")
+        and (when := entry.get("when") or entry.get("condition"))
+    ]
@@ -5,8 +5,15 @@ for migration demos and documentation.
 """
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
-from typing import Dict, List
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Union
+
+try:
+    import msgspec
+except ImportError:  # Optional dependency
+    msgspec = None
 
 
 @dataclass(frozen=True)
@@ -15,6 +22,16 @@ class RuleSpec:
     match: str
 
 
+def _rules_from_edges(edges: Iterable[object]) -> List[RuleSpec]:
+    return [
+        RuleSpec(tool=str(edge["to"]), match=str(condition))
+        for edge in edges
+        if isinstance(edge, dict)
+        and edge.get("to")
+        and (condition := edge.get("when") or edge.get("condition"))
+    ]
+
+
 def convert_graph(graph: Dict[str, object]) -> List[RuleSpec]:
     """Convert a tiny graph format to rule specs.
 
@@ -25,16 +42,11 @@ def convert_graph(graph: Dict[str, object]) -> List[RuleSpec]:
     }
     """
     edges = graph.get("edges", []) if isinstance(graph, dict) else []
-    rules: List[RuleSpec] = []
-    for edge in edges:
-        if not isinstance(edge, dict):
-            continue
-        target = edge.get("to")
-        condition = edge.get("when")
-        if not target or not condition:
-            continue
-        rules.append(RuleSpec(tool=str(target), match=str(condition)))
-    return rules
+    return [
+        RuleSpec(tool=str(edge["to"]), match=str(edge["when"]))
+        for edge in edges
+        if isinstance(edge, dict) and edge.get("to") and edge.get("when")
+    ]
 
 
 def convert_langgraph_spec(spec: Dict[str, object]) -> List[RuleSpec]:
@@ -45,50 +57,70 @@ def convert_langgraph_spec(spec: Dict[str, object]) -> List[RuleSpec]:
     - edges: [{"from": "router", "to": "tool_name", "when": "contains:keyword"}]
     - conditional_edges: [{"from": "router", "conditions": [{"when": "contains:foo", "to": "tool"}]}]
     """
-    rules: List[RuleSpec] = []
     if not isinstance(spec, dict):
-        return rules
-
-    edges = spec.get("edges", []) or []
-    for edge in edges:
-        if not isinstance(edge, dict):
-            continue
-        target = edge.get("to")
-        condition = edge.get("when") or edge.get("condition")
-        if target and condition:
-            rules.append(RuleSpec(tool=str(target), match=str(condition)))
+        return []
 
     conditional = spec.get("conditional_edges", []) or []
-    for entry in conditional:
-        if not isinstance(entry, dict):
-            continue
-        conditions = entry.get("conditions", []) or []
-        for condition_entry in conditions:
-            if not isinstance(condition_entry, dict):
-                continue
-            target = condition_entry.get("to")
-            condition = condition_entry.get("when") or condition_entry.get("condition")
-            if target and condition:
-                rules.append(RuleSpec(tool=str(target), match=str(condition)))
+    conditions = chain.from_iterable(
+        entry.get("conditions", []) or [] for entry in conditional if isinstance(entry, dict)
+    )
+    return _rules_from_edges(spec.get("edges", []) or []) + _rules_from_edges(conditions)
+
+
+if msgspec is not None:
+
+    class _EdgeSpec(msgspec.Struct):
+        to: Optional[str] = None
+        when: Optional[str] = None
+        condition: Optional[str] = None
+
+    class _ConditionalEdgeSpec(msgspec.Struct):
+        conditions: List[_EdgeSpec] = []
+
+    class _LangGraphSpec(msgspec.Struct):
+        edges: List[_EdgeSpec] = []
+        conditional_edges: List[_ConditionalEdgeSpec] = []
 
-    return rules
+
+def convert_langgraph_bytes(data: Union[bytes, str]) -> List[RuleSpec]:
+    """Decode a JSON LangGraph-like spec and convert it to rule specs.
+
+    With msgspec installed the document is validated into typed structs
+    while parsing, skipping intermediate dicts. Documents that do not fit
+    the typed schema fall back to ``convert_langgraph_spec``.
+    """
+    if msgspec is not None:
+        try:
+            spec = msgspec.json.decode(data, type=_LangGraphSpec)
+        except msgspec.DecodeError:
+            pass
+        else:
+            edges = chain(spec.edges, chain.from_iterable(entry.conditions for entry in spec.conditional_edges))
+            return [
+                RuleSpec(tool=edge.to, match=condition)
+                for edge in edges
+                if edge.to and (condition := edge.when or edge.condition)
+            ]
+    return convert_langgraph_spec(json.loads(data))
+
+
+_SNIPPET_HEADER = ("from src.router import Rule, RuleRouter", "", "router = RuleRouter()")
+_KEYWORD_RULE_TEMPLATE = (
+    'router.add_rule(Rule(tool="{tool}", predicate=lambda text: "{keyword}" in text.lower(),'
+    ' param_builder=lambda text: {{"input": text}}, confidence=0.7, reason="interop"))'
+)
+_CATCH_ALL_RULE_TEMPLATE = (
+    'router.add_rule(Rule(tool="{tool}", predicate=lambda text: True,'
+    ' param_builder=lambda text: {{"input": text}}, confidence=0.5, reason="interop"))'
+)
+
+
+def _render_rule(rule: RuleSpec) -> str:
+    if rule.match.startswith("contains:"):
+        return _KEYWORD_RULE_TEMPLATE.format(tool=rule.tool, keyword=rule.match.split(":", 1)[1])
+    return _CATCH_ALL_RULE_TEMPLATE.format(tool=rule.tool)
 
 
 def to_rule_router_snippet(rules: List[RuleSpec]) -> str:
     """Render a minimal RuleRouter snippet for docs and demos."""
-    lines = ["from src.router import Rule, RuleRouter", "", "router = RuleRouter()"]
-    for rule in rules:
-        if rule.match.startswith("contains:"):
-            keyword = rule.match.split(":", 1)[1]
-            lines.append(
-                "router.add_rule(Rule(tool=\"%s\", predicate=lambda text: \"%s\" in text.lower(),"
-                " param_builder=lambda text: {\"input\": text}, confidence=0.7, reason=\"interop\"))"
-                % (rule.tool, keyword)
-            )
-        else:
-            lines.append(
-                "router.add_rule(Rule(tool=\"%s\", predicate=lambda text: True,"
-                " param_builder=lambda text: {\"input\": text}, confidence=0.5, reason=\"interop\"))"
-                % rule.tool
-            )
-    return "\n".join(lines)
+    return "\n".join(chain(_SNIPPET_HEADER, map(_render_rule, rules)))
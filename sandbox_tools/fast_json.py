@@ -0,0 +1,27 @@
+"""JSON helpers for sandbox tools: orjson when installed, stdlib otherwise.
+
+Kept separate from ``src/fast_json.py`` because only ``sandbox_tools/`` is
+mounted inside the sandbox container.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; stdlib handles them
+    return json.dumps(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,20 +1,45 @@
-import json
+import ast
 import sys
+from functools import lru_cache
+from types import CodeType
+from typing import Tuple
+
+from fast_json import dumps, loads
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: str) -> CodeType:
+    return compile(ast.parse(expression, mode="eval"), "<sandbox>", "eval")
+
+
+def _evaluate(expression: str) -> Tuple[bool, str]:
+    """Evaluate and encode in one step: (ok, JSON outcome), serialized exactly once."""
+    try:
+        result = eval(_compile(expression), {"__builtins__": {}}, {})
+        return True, dumps({"status": "ok", "result": result})
+    except Exception as exc:  # unserializable results land here too
+        return False, dumps({"status": "error", "error": str(exc)})
 
 
 def main() -> int:
-    payload = json.loads(sys.stdin.read() or "{}")
+    payload = loads(sys.stdin.read() or "{}")
+    expressions = payload.get("expressions")
+    if isinstance(expressions, list):
+        if not all(isinstance(expr, str) and expr for expr in expressions):
+            print(dumps({"status": "error", "error": "missing_expression"}))
+            return 1
+        # Splice the already-encoded outcomes rather than decoding and re-encoding them.
+        encoded = ",".join(outcome for _, outcome in map(_evaluate, expressions))
+        print(f'{{"status":"ok","results":[{encoded}]}}')
+        return 0
+
     expression = payload.get("expression", "")
     if not expression:
-        print(json.dumps({"status": "error", "error": "missing_expression"}))
-        return 1
-    try:
-        result = eval(expression, {"__builtins__": {}})
-        print(json.dumps({"status": "ok", "result": result}))
-        return 0
-    except Exception as exc:
-        print(json.dumps({"status": "error", "error": str(exc)}))
+        print(dumps({"status": "error", "error": "missing_expression"}))
         return 1
+    ok, outcome = _evaluate(expression)
+    print(outcome)
+    return 0 if ok else 1
 
 
 if __name__ == "__main__":
@@ -1,67 +1,101 @@
-import json
-import os
 import subprocess
 import sys
-import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from fast_json import dumps, loads
+from python_worker import DEFAULT_TIMEOUT_SEC, read_frame, write_frame
+
+WORKER_PATH = Path(__file__).resolve().with_name("python_worker.py")
+
+
+class PythonWorker:
+    """One worker interpreter reused for every snippet in a sandbox run."""
+
+    def __init__(self) -> None:
+        self._proc = self._spawn()
+
+    @staticmethod
+    def _spawn() -> subprocess.Popen:
+        return subprocess.Popen(
+            [sys.executable, "-I", "-S", str(WORKER_PATH)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd="/tmp",
+            env={"PYTHONUNBUFFERED": "1"},
+        )
+
+    def run(self, code: str, stdin: str = "", timeout_sec: float = DEFAULT_TIMEOUT_SEC) -> Dict[str, Any]:
+        try:
+            write_frame(self._proc.stdin, {"code": code, "stdin": stdin, "timeout_sec": timeout_sec})
+            response = read_frame(self._proc.stdout)
+        except (BrokenPipeError, ValueError):
+            response = None
+        if response is not None:
+            return response
+        # The snippet took the worker down (e.g. os._exit); report and respawn.
+        exit_code = self._proc.wait() or 1
+        self._proc = self._spawn()
+        return {"status": "error", "stdout": "", "stderr": "", "exit_code": exit_code}
+
+    def close(self) -> None:
+        if self._proc.stdin:
+            self._proc.stdin.close()
+        self._proc.wait()
+
+
+def _format_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    if result["exit_code"] != 0:
+        return {
+            "status": "error",
+            "error": result["stderr"].strip() or "script_failed",
+            "exit_code": result["exit_code"],
+        }
+    return {"status": "ok", "stdout": result["stdout"].strip()}
+
+
+def _run_batch(snippets: List[Dict[str, Any]], timeout_sec: float = DEFAULT_TIMEOUT_SEC) -> List[Dict[str, Any]]:
+    worker = PythonWorker()
+    try:
+        return [
+            _format_result(worker.run(str(item.get("code", "")), str(item.get("stdin", "") or ""), timeout_sec))
+            for item in snippets
+        ]
+    finally:
+        worker.close()
 
 
 def main() -> int:
-    payload = json.loads(sys.stdin.read() or "{}")
+    payload = loads(sys.stdin.read() or "{}")
+    timeout_sec = float(payload.get("timeout_sec") or DEFAULT_TIMEOUT_SEC)
+    snippets = payload.get("snippets")
+    if isinstance(snippets, list):
+        if not all(isinstance(item, dict) and item.get("code") for item in snippets):
+            print(dumps({"status": "error", "error": "missing_code"}))
+            return 1
+        try:
+            results = _run_batch(snippets, timeout_sec)
+        except Exception as exc:
+            print(dumps({"status": "error", "error": str(exc)}))
+            return 1
+        print(dumps({"status": "ok", "results": results}))
+        return 0
+
     code = payload.get("code", "")
     stdin = payload.get("stdin", "")
     if not code:
-        print(json.dumps({"status": "error", "error": "missing_code"}))
-        return 1
-
-    script_path = None
-    try:
-        with tempfile.NamedTemporaryFile("w", delete=False, suffix=".py", prefix="sandbox_", encoding="utf-8") as handle:
-            handle.write(code)
-            script_path = handle.name
-    except OSError as exc:
-        print(json.dumps({"status": "error", "error": f"write_failed:{exc}"}))
+        print(dumps({"status": "error", "error": "missing_code"}))
         return 1
 
     try:
-        completed = subprocess.run(
-            [sys.executable, "-I", "-S", script_path],
-            input=stdin,
-            text=True,
-            capture_output=True,
-            check=False,
-            cwd="/tmp",
-            env={"PYTHONUNBUFFERED": "1"},
-        )
+        result = _run_batch([{"code": code, "stdin": stdin}], timeout_sec)[0]
     except Exception as exc:
-        print(json.dumps({"status": "error", "error": str(exc)}))
+        print(dumps({"status": "error", "error": str(exc)}))
         return 1
-    finally:
-        if script_path:
-            try:
-                os.remove(script_path)
-            except OSError:
-                pass
-
-    if completed.returncode != 0:
-        print(
-            json.dumps(
-                {
-                    "status": "error",
-                    "error": completed.stderr.strip() or "script_failed",
-                    "exit_code": completed.returncode,
-                }
-            )
-        )
-        return completed.returncode
-
-    print(
-        json.dumps(
-            {
-                "status": "ok",
-                "stdout": completed.stdout.strip(),
-            }
-        )
-    )
+
+    print(dumps(result))
+    if result["status"] != "ok":
+        return result["exit_code"]
     return 0
 
 
@@ -0,0 +1,200 @@
+"""Long-lived Python snippet worker speaking length-prefixed JSON over stdio.
+
+Each frame is a 4-byte big-endian length followed by a UTF-8 JSON object.
+Requests are ``{"code": str, "stdin": str, "timeout_sec": float}``; responses are
+``{"status", "stdout", "stderr", "exit_code"}``. Every snippet runs in a child
+forked from the worker: it gets its own builtins, modules and fds 0-2, so nothing
+leaks between frames, and the interpreter start-up cost is still paid only once.
+"""
+import json
+import os
+import select
+import signal
+import struct
+import sys
+import time
+import traceback
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+_HEADER = struct.Struct(">I")
+
+DEFAULT_TIMEOUT_SEC = 10.0
+# Same code the Docker runner reports when a whole run times out.
+TIMEOUT_EXIT_CODE = 124
+
+
+def read_frame(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    (length,) = _HEADER.unpack(header)
+    return json.loads(stream.read(length).decode("utf-8"))
+
+
+def write_frame(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    body = json.dumps(message).encode("utf-8")
+    stream.write(_HEADER.pack(len(body)) + body)
+    stream.flush()
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    sys.stderr.write(f"{exc.code}\n")
+    return 1
+
+
+def _run_child(code: str, stdin_fd: int, stdout_fd: int, stderr_fd: int) -> None:
+    """Body of the forked child: capture at the fd level, run, and _exit."""
+    exit_code = 1
+    try:
+        os.setpgid(0, 0)
+        os.dup2(stdin_fd, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        # Drop everything inherited from the worker, protocol pipe included.
+        os.closerange(3, os.sysconf("SC_OPEN_MAX"))
+        sys.stdin = open(0, "r", encoding="utf-8", closefd=False)
+        sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+        sys.stderr = open(2, "w", encoding="utf-8", closefd=False)
+        try:
+            exec(compile(code, "<sandbox>", "exec"), {"__name__": "__main__"})
+            exit_code = 0
+        except SystemExit as exc:
+            exit_code = _exit_code(exc)
+        except BaseException as exc:
+            # Skip this module's frame so the traceback starts at the snippet.
+            traceback.print_exception(type(exc), exc, exc.__traceback__.tb_next, file=sys.stderr)
+            exit_code = 1
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+    finally:
+        os._exit(exit_code)
+
+
+def _wait(pid: int, deadline: float) -> Optional[int]:
+    """Wait status of `pid`, or None if it is still running at `deadline` (monotonic)."""
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):  # pre-5.3 kernels / non-Linux
+        pidfd = None
+    try:
+        while True:
+            waited, status = os.waitpid(pid, os.WNOHANG)
+            if waited:
+                return status
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if pidfd is not None:
+                select.select([pidfd], [], [], remaining)
+            else:
+                time.sleep(min(remaining, 0.01))
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+
+def _pump(stdin_w: int, stdin: bytes, out_r: int, err_r: int, deadline: float) -> Tuple[bytes, bytes, bool]:
+    """Feed stdin and drain stdout/stderr together until both close or the deadline.
+
+    Draining while the child runs keeps it from blocking on a full pipe.
+    Returns (stdout, stderr, finished).
+    """
+    chunks: Dict[int, List[bytes]] = {out_r: [], err_r: []}
+    readers = [out_r, err_r]
+    writers = [stdin_w]
+    os.set_blocking(stdin_w, False)
+    view = memoryview(stdin)
+    try:
+        while readers:
+            if writers and not view:
+                os.close(stdin_w)
+                writers = []
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, writable, _ = select.select(readers, writers, [], remaining)
+            for fd in readable:
+                chunk = os.read(fd, 65536)
+                if chunk:
+                    chunks[fd].append(chunk)
+                else:
+                    readers.remove(fd)
+            if writable:
+                try:
+                    view = view[os.write(stdin_w, view):]
+                except BrokenPipeError:  # the child closed stdin without reading it all
+                    view = view[:0]
+    finally:
+        for fd in [*writers, out_r, err_r]:
+            os.close(fd)
+    return b"".join(chunks[out_r]), b"".join(chunks[err_r]), not readers
+
+
+def run_snippet(code: str, stdin: str = "", timeout_sec: float = DEFAULT_TIMEOUT_SEC) -> Dict[str, Any]:
+    deadline = time.monotonic() + timeout_sec
+    stdin_r, stdin_w = os.pipe()
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        _run_child(code, stdin_r, out_w, err_w)
+    for fd in (stdin_r, out_w, err_w):
+        os.close(fd)
+
+    stdout, stderr, finished = _pump(stdin_w, (stdin or "").encode("utf-8"), out_r, err_r, deadline)
+    status = _wait(pid, deadline) if finished else None
+    timed_out = status is None
+    if timed_out:
+        # The child leads its own process group; take its children with it.
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        _, status = os.waitpid(pid, 0)
+
+    stderr_text = stderr.decode("utf-8", "replace")
+    if timed_out:
+        exit_code = TIMEOUT_EXIT_CODE
+        stderr_text = f"{stderr_text}snippet_timeout after {timeout_sec:g}s\n"
+    else:
+        exit_code = os.waitstatus_to_exitcode(status)
+    return {
+        "status": "ok" if exit_code == 0 else "error",
+        "stdout": stdout.decode("utf-8", "replace"),
+        "stderr": stderr_text,
+        "exit_code": exit_code,
+    }
+
+
+def main() -> int:
+    # Keep the protocol on a private fd; snippets run in children that close it,
+    # so nothing they write can reach the response frames.
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+    requests = sys.stdin.buffer
+    while True:
+        request = read_frame(requests)
+        if request is None:
+            return 0
+        write_frame(
+            protocol_out,
+            run_snippet(
+                str(request.get("code", "")),
+                str(request.get("stdin", "") or ""),
+                float(request.get("timeout_sec") or DEFAULT_TIMEOUT_SEC),
+            ),
+        )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
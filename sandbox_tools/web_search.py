@@ -1,14 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import re
 import sys
 from html import unescape
+from itertools import islice
 from typing import Any, Dict, List
 from urllib.parse import quote
 from urllib.request import Request, urlopen
 
+from fast_json import dumps, loads
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # Optional dependency
+    HTMLParser = None
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency
+    aiohttp = None
+
 DUCKDUCKGO_HTML = "https://duckduckgo.com/html/?q="
+USER_AGENT = "orchestrators-v2-sandbox"
+FETCH_TIMEOUT_SEC = 10
+BATCH_CONCURRENCY = 8
+
+# Bytes patterns: the page is parsed undecoded and only matched spans are
+# turned into text.
+_RESULT_RE = re.compile(
+    rb'<a[^>]+class="result__a"[^>]+href="(?P<url>[^"]+)"[^>]*>(?P<title>.*?)</a>',
+    re.IGNORECASE | re.DOTALL,
+)
+_SNIPPET_RE = re.compile(
+    rb'<a[^>]+class="result__snippet"[^>]*>(?P<snippet>.*?)</a>',
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(rb"<[^>]*>")
 
 
 def _load_payload() -> Dict[str, Any]:
@@ -16,56 +45,148 @@ def _load_payload() -> Dict[str, Any]:
     if not raw:
         return {}
     try:
-        return json.loads(raw)
+        return loads(raw)
     except json.JSONDecodeError:
         return {}
 
 
-def _fetch_html(query: str) -> str:
+def _fetch_html(query: str) -> bytes:
     url = f"{DUCKDUCKGO_HTML}{quote(query)}"
-    req = Request(url, headers={"User-Agent": "orchestrators-v2-sandbox"})
-    with urlopen(req, timeout=10) as resp:
-        return resp.read().decode("utf-8", errors="ignore")
+    req = Request(url, headers={"User-Agent": USER_AGENT})
+    with urlopen(req, timeout=FETCH_TIMEOUT_SEC) as resp:
+        return resp.read()
 
 
-def _parse_results(html: str, max_results: int, snippet_max_chars: int) -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
-    pattern = re.compile(r'<a[^>]+class="result__a"[^>]+href="(?P<url>[^"]+)"[^>]*>(?P<title>.*?)</a>', re.IGNORECASE)
-    snippet_pattern = re.compile(r'<a[^>]+class="result__snippet"[^>]*>(?P<snippet>.*?)</a>', re.IGNORECASE)
-    snippets = [unescape(re.sub(r"<.*?>", "", s.group("snippet"))) for s in snippet_pattern.finditer(html)]
+async def _fetch_html_async(session: "aiohttp.ClientSession", query: str) -> bytes:
+    async with session.get(f"{DUCKDUCKGO_HTML}{quote(query)}", headers={"User-Agent": USER_AGENT}) as resp:
+        return await resp.read()
+
+
+async def _fetch_many_async(queries: List[str]) -> List[Any]:
+    connector = aiohttp.TCPConnector(limit=BATCH_CONCURRENCY, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT_SEC)
+    # raise_for_status: a 4xx/5xx page is an error, as urlopen's HTTPError is on the sync path.
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, raise_for_status=True) as session:
+        return await asyncio.gather(
+            *(_fetch_html_async(session, query) for query in queries),
+            return_exceptions=True,
+        )
+
 
-    for idx, match in enumerate(pattern.finditer(html)):
+def _fetch_many(queries: List[str]) -> List[Any]:
+    """Fetch several queries over one keep-alive session; errors are returned in place."""
+    if aiohttp is not None:
+        return asyncio.run(_fetch_many_async(queries))
+    htmls: List[Any] = []
+    for query in queries:
+        try:
+            htmls.append(_fetch_html(query))
+        except Exception as exc:
+            htmls.append(exc)
+    return htmls
+
+
+def _truncate(snippet: str, snippet_max_chars: int) -> str:
+    if len(snippet) > snippet_max_chars:
+        return snippet[:snippet_max_chars].rstrip()
+    return snippet
+
+
+def _text(span: bytes) -> str:
+    return unescape(_TAG_RE.sub(b"", span).decode("utf-8", errors="ignore"))
+
+
+def _parse_results_html(html: bytes, max_results: int, snippet_max_chars: int) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for node in HTMLParser(html).css(".result"):
         if len(results) >= max_results:
             break
-        title = unescape(re.sub(r"<.*?>", "", match.group("title")))
-        url = unescape(match.group("url"))
-        snippet = snippets[idx] if idx < len(snippets) else ""
-        if len(snippet) > snippet_max_chars:
-            snippet = snippet[:snippet_max_chars].rstrip()
-        results.append({"title": title, "url": url, "snippet": snippet})
+        link = node.css_first(".result__a")
+        if link is None:
+            continue
+        snippet_node = node.css_first(".result__snippet")
+        snippet = snippet_node.text().strip() if snippet_node is not None else ""
+        results.append(
+            {
+                "title": link.text().strip(),
+                "url": link.attributes.get("href") or "",
+                "snippet": _truncate(snippet, snippet_max_chars),
+            }
+        )
     return results
 
 
+def _parse_results_regex(html: bytes, max_results: int, snippet_max_chars: int) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    snippets = _SNIPPET_RE.finditer(html)
+
+    for match in islice(_RESULT_RE.finditer(html), max_results):
+        title = _text(match.group("title"))
+        url = unescape(match.group("url").decode("utf-8", errors="ignore"))
+        snippet_match = next(snippets, None)
+        snippet = _text(snippet_match.group("snippet")) if snippet_match else ""
+        results.append({"title": title, "url": url, "snippet": _truncate(snippet, snippet_max_chars)})
+    return results
+
+
+def _parse_results(html: bytes, max_results: int, snippet_max_chars: int) -> List[Dict[str, Any]]:
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    if HTMLParser is not None:
+        return _parse_results_html(html, max_results, snippet_max_chars)
+    return _parse_results_regex(html, max_results, snippet_max_chars)
+
+
+def main_batch(payload: Dict[str, Any]) -> int:
+    queries = [str(q or "").strip() for q in payload.get("queries") or []]
+    max_results = int(payload.get("max_results", 5) or 5)
+    snippet_max_chars = int(payload.get("snippet_max_chars", 400) or 400)
+
+    if not queries or not all(queries):
+        print(dumps({"status": "error", "error": "query_required"}))
+        return 2
+    if max_results <= 0:
+        print(dumps({"status": "error", "error": "max_results_invalid"}))
+        return 2
+
+    batch: List[Dict[str, Any]] = []
+    for query, html in zip(queries, _fetch_many(queries)):
+        if isinstance(html, BaseException):
+            batch.append({"query": query, "status": "error", "error": str(html)})
+            continue
+        batch.append(
+            {
+                "query": query,
+                "status": "ok",
+                "results": _parse_results(html, max_results, snippet_max_chars),
+            }
+        )
+    print(dumps({"status": "ok", "batch": batch}))
+    return 0
+
+
 def main() -> int:
     payload = _load_payload()
+    if "queries" in payload:
+        return main_batch(payload)
     query = str(payload.get("query", "") or "").strip()
     max_results = int(payload.get("max_results", 5) or 5)
     snippet_max_chars = int(payload.get("snippet_max_chars", 400) or 400)
 
     if not query:
-        print(json.dumps({"status": "error", "error": "query_required"}))
+        print(dumps({"status": "error", "error": "query_required"}))
         return 2
     if max_results <= 0:
-        print(json.dumps({"status": "error", "error": "max_results_invalid"}))
+        print(dumps({"status": "error", "error": "max_results_invalid"}))
         return 2
 
     try:
         html = _fetch_html(query)
         results = _parse_results(html, max_results, snippet_max_chars)
-        print(json.dumps({"status": "ok", "results": results}))
+        print(dumps({"status": "ok", "results": results}))
         return 0
     except Exception as exc:
-        print(json.dumps({"status": "error", "error": str(exc)}))
+        print(dumps({"status": "error", "error": str(exc)}))
         return 1
 
 
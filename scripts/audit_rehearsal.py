@@ -7,8 +7,8 @@ runs the compliance report generator to produce PDF + JSON-LD evidence.
 from __future__ import annotations
 
 import argparse
-import json
 import sqlite3
+from contextlib import closing
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, List
@@ -18,78 +18,87 @@ import sys
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
 
-from scripts.generate_compliance_report import generate_report, generate_jsonld
+from scripts.generate_compliance_report import collect_compliance_data, generate_jsonld, generate_report
+from src.fast_json import dumps
+from src.tracer import TRACES_CREATED_AT_INDEX
 
+REHEARSAL_STEP_NOTE = "synthetic high-token rehearsal (no LLM invocation)"
 
-def _init_trace_db(db_path: Path) -> None:
+
+def _connect(db_path: Path) -> sqlite3.Connection:
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(db_path) as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS traces (
-                id TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL,
-                metadata_json TEXT
-            )
-            """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def _init_trace_db(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS traces (
+            id TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            metadata_json TEXT
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS trace_steps (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                trace_id TEXT NOT NULL,
-                step_type TEXT NOT NULL,
-                step_json TEXT NOT NULL,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+    conn.execute(TRACES_CREATED_AT_INDEX)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS trace_steps (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trace_id TEXT NOT NULL,
+            step_type TEXT NOT NULL,
+            step_json TEXT NOT NULL,
+            created_at TEXT NOT NULL
         )
-        conn.commit()
+        """
+    )
 
 
-def _insert_trace(db_path: Path, trace_id: str, metadata: Dict[str, Any]) -> None:
+def _insert_trace(conn: sqlite3.Connection, trace_id: str, metadata: Dict[str, Any]) -> None:
     created_at = datetime.now(timezone.utc).isoformat()
-    payload = json.dumps(metadata)
-    with sqlite3.connect(db_path) as conn:
-        conn.execute("DELETE FROM traces WHERE id = ?", (trace_id,))
-        conn.execute(
-            "INSERT INTO traces (id, created_at, metadata_json) VALUES (?, ?, ?)",
-            (trace_id, created_at, payload),
-        )
-        conn.commit()
+    payload = dumps(metadata)
+    conn.execute("DELETE FROM traces WHERE id = ?", (trace_id,))
+    conn.execute(
+        "INSERT INTO traces (id, created_at, metadata_json) VALUES (?, ?, ?)",
+        (trace_id, created_at, payload),
+    )
 
 
-def _insert_steps(db_path: Path, trace_id: str, steps: List[Dict[str, Any]]) -> None:
-    with sqlite3.connect(db_path) as conn:
-        conn.execute("DELETE FROM trace_steps WHERE trace_id = ?", (trace_id,))
-        for step in steps:
-            created_at = step.get("created_at") or datetime.now(timezone.utc).isoformat()
-            conn.execute(
-                """
-                INSERT INTO trace_steps (trace_id, step_type, step_json, created_at)
-                VALUES (?, ?, ?, ?)
-                """,
-                (trace_id, step["step_type"], json.dumps(step["payload"]), created_at),
-            )
-        conn.commit()
+def _insert_steps(conn: sqlite3.Connection, trace_id: str, steps: List[Dict[str, Any]]) -> None:
+    now_iso = datetime.now(timezone.utc).isoformat()
+    rows = [
+        (trace_id, step["step_type"], dumps(step["payload"]), step.get("created_at") or now_iso)
+        for step in steps
+    ]
+    conn.execute("DELETE FROM trace_steps WHERE trace_id = ?", (trace_id,))
+    conn.executemany(
+        """
+        INSERT INTO trace_steps (trace_id, step_type, step_json, created_at)
+        VALUES (?, ?, ?, ?)
+        """,
+        rows,
+    )
 
 
 def _build_rehearsal_steps(total_tokens: int, step_count: int) -> List[Dict[str, Any]]:
     per_step = max(1, total_tokens // step_count)
-    steps = []
-    for idx in range(step_count):
-        steps.append(
-            {
-                "step_type": "audit_rehearsal",
-                "payload": {
-                    "step": idx + 1,
-                    "tier": "tier3",
-                    "tokens_used": per_step,
-                    "note": "synthetic high-token rehearsal (no LLM invocation)",
-                },
-            }
-        )
-    return steps
+    return [
+        {
+            "step_type": "audit_rehearsal",
+            "payload": {
+                "step": idx + 1,
+                "tier": "tier3",
+                "tokens_used": per_step,
+                "note": REHEARSAL_STEP_NOTE,
+            },
+        }
+        for idx in range(step_count)
+    ]
 
 
 def main() -> int:
@@ -129,8 +138,6 @@ def main() -> int:
     output_pdf = Path(args.output_pdf)
     output_jsonld = Path(args.output_jsonld)
 
-    _init_trace_db(trace_db)
-
     trace_id = "audit-rehearsal-tier3"
     metadata = {
         "mode": "audit_rehearsal",
@@ -138,13 +145,17 @@ def main() -> int:
         "total_tokens": args.total_tokens,
         "note": "synthetic stress run (no LLM calls)",
     }
-    _insert_trace(trace_db, trace_id, metadata)
-
     steps = _build_rehearsal_steps(args.total_tokens, args.steps)
-    _insert_steps(trace_db, trace_id, steps)
 
-    generate_report(output_pdf, trace_db)
-    generate_jsonld(output_jsonld, trace_db)
+    with closing(_connect(trace_db)) as conn:
+        with conn:
+            _init_trace_db(conn)
+            _insert_trace(conn, trace_id, metadata)
+            _insert_steps(conn, trace_id, steps)
+
+    report_data = collect_compliance_data(trace_db)
+    generate_report(output_pdf, report_data)
+    generate_jsonld(output_jsonld, report_data)
 
     print("Audit rehearsal complete.")
     print(f"Trace DB: {trace_db}")
@@ -5,7 +5,10 @@ from __future__ import annotations
 import json
 import os
 import sqlite3
+import sys
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -13,27 +16,95 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.fast_json import dumps_indented, loads
+
+# Vertical offsets used by generate_report, computed once.
+DY_02 = 0.2 * inch
+DY_025 = 0.25 * inch
+DY_03 = 0.3 * inch
+DY_035 = 0.35 * inch
+DY_04 = 0.4 * inch
+
+RECENT_TRACE_LIMIT = 5
+
+
+# Tuned for the metadata_json scan: 64 MiB page cache, in-memory temp b-trees
+# for sorting, and up to 1 GiB read zero-copy through mmap.
+_READ_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",
+)
+
+
+def _connect_readonly(db_path: Path) -> sqlite3.Connection:
+    """Open the trace DB read-only for reporting.
+
+    ``immutable=1`` skips locking and change detection entirely, so it is only
+    used when no WAL sidecar exists (a live writer could otherwise be missed).
+    """
+    query = "mode=ro"
+    if not db_path.with_name(db_path.name + "-wal").exists():
+        query += "&immutable=1"
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?{query}", uri=True)
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 
 def _fetch_trace_summary(db_path: Path) -> Tuple[int, int, List[Tuple[str, str]]]:
     if not db_path.exists():
         return 0, 0, []
 
-    conn = sqlite3.connect(str(db_path))
+    conn = _connect_readonly(db_path)
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM traces")
-        trace_count = cursor.fetchone()[0] or 0
-        cursor.execute("SELECT COUNT(*) FROM trace_steps")
-        step_count = cursor.fetchone()[0] or 0
         cursor.execute(
-            "SELECT id, created_at FROM traces ORDER BY created_at DESC LIMIT 5"
+            "SELECT (SELECT COUNT(*) FROM traces), (SELECT COUNT(*) FROM trace_steps)"
+        )
+        trace_count, step_count = cursor.fetchone()
+        trace_count = trace_count or 0
+        step_count = step_count or 0
+        cursor.execute(
+            "SELECT id, created_at FROM traces ORDER BY created_at DESC LIMIT ?",
+            (RECENT_TRACE_LIMIT,),
         )
-        recent = [(row[0], row[1]) for row in cursor.fetchall()]
-        return trace_count, step_count, recent
+        # Rows are already (id, created_at) tuples; no row_factory is set.
+        return trace_count, step_count, cursor.fetchmany(RECENT_TRACE_LIMIT)
     finally:
         conn.close()
 
 
+_REHEARSAL_SQL = """
+SELECT COUNT(*), COALESCE(MAX(CAST(json_extract(metadata_json, '$.total_tokens') AS INTEGER)), 0)
+FROM traces
+WHERE CASE WHEN json_valid(metadata_json) THEN json_extract(metadata_json, '$.mode') END = 'audit_rehearsal'
+"""
+
+
+def _scan_rehearsal_metadata(conn: sqlite3.Connection) -> Tuple[int, int]:
+    """Python fallback for SQLite builds without the JSON1 functions."""
+    rehearsal_traces = 0
+    max_total_tokens = 0
+    cursor = conn.execute("SELECT metadata_json FROM traces")
+    for (metadata_json,) in cursor:
+        if not metadata_json:
+            continue
+        try:
+            metadata = loads(metadata_json)
+        except json.JSONDecodeError:
+            continue
+        if metadata.get("mode") == "audit_rehearsal":
+            rehearsal_traces += 1
+            max_total_tokens = max(max_total_tokens, int(metadata.get("total_tokens", 0)))
+    return rehearsal_traces, max_total_tokens
+
+
 def _fetch_trace_rehearsal_metadata(db_path: Path) -> Dict[str, Any]:
     if not db_path.exists():
         return {
@@ -42,21 +113,14 @@ def _fetch_trace_rehearsal_metadata(db_path: Path) -> Dict[str, Any]:
             "max_total_tokens": 0,
         }
 
-    rehearsal_traces = 0
-    max_total_tokens = 0
-    with sqlite3.connect(str(db_path)) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT metadata_json FROM traces")
-        for (metadata_json,) in cursor.fetchall():
-            if not metadata_json:
-                continue
-            try:
-                metadata = json.loads(metadata_json)
-            except json.JSONDecodeError:
-                continue
-            if metadata.get("mode") == "audit_rehearsal":
-                rehearsal_traces += 1
-                max_total_tokens = max(max_total_tokens, int(metadata.get("total_tokens", 0)))
+    conn = _connect_readonly(db_path)
+    try:
+        try:
+            rehearsal_traces, max_total_tokens = conn.execute(_REHEARSAL_SQL).fetchone()
+        except sqlite3.OperationalError:
+            rehearsal_traces, max_total_tokens = _scan_rehearsal_metadata(conn)
+    finally:
+        conn.close()
 
     return {
         "rehearsal_detected": rehearsal_traces > 0,
@@ -68,67 +132,141 @@ def _load_vulnerability_log(log_path: Path) -> Optional[Dict[str, Any]]:
     if not log_path.exists():
         return None
     try:
-        return json.loads(log_path.read_text())
+        return loads(log_path.read_bytes())
     except json.JSONDecodeError:
         return None
 
 
+@lru_cache(maxsize=1024)
+def _classify_mitigation(mitigation: str) -> Tuple[str, bool, bool]:
+    """(status, is_mitigated, is_accepted); mitigation texts repeat across entries."""
+    is_mitigated = "Mitigated" in mitigation
+    is_accepted = "Accepted" in mitigation
+    if is_mitigated:
+        status = "Architecturally Mitigated"
+    elif is_accepted:
+        status = "Architecturally Accepted (Non-Reachable)"
+    else:
+        status = "Unclassified"
+    return status, is_mitigated, is_accepted
+
+
 def _architectural_status(entry: Dict[str, Any]) -> str:
-    mitigation = entry.get("mitigation") or ""
-    if "Mitigated" in mitigation:
-        return "Architecturally Mitigated"
-    if "Accepted" in mitigation:
-        return "Architecturally Accepted (Non-Reachable)"
-    return "Unclassified"
+    return _classify_mitigation(entry.get("mitigation") or "")[0]
+
+
+def _summarize_assessments(assessments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Count mitigated/accepted advisories and build the rendered rows in one pass."""
+    mitigated = 0
+    accepted = 0
+    rows = []
+    append = rows.append
+    for entry in assessments:
+        get = entry.get
+        mitigation = get("mitigation") or ""
+        status, is_mitigated, is_accepted = _classify_mitigation(mitigation)
+        mitigated += is_mitigated
+        accepted += is_accepted
+        append(
+            {
+                "dependency": get("dependency"),
+                "advisory_id": get("advisory_id"),
+                "ghsa_id": get("ghsa_id"),
+                "reachability": get("reachability"),
+                "reachability_notes": mitigation or get("reason"),
+                "architectural_status": status,
+                "review_by": get("review_by"),
+            }
+        )
+    return {"total": len(rows), "mitigated": mitigated, "accepted": accepted, "assessments": rows}
 
 
-def generate_report(output_path: Path, trace_db_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+@dataclass(frozen=True, slots=True)
+class ComplianceData:
+    """One consistent snapshot shared by the PDF and JSON-LD renderers."""
 
+    trace_db_path: Path
+    trace_count: int
+    step_count: int
+    recent_traces: List[Tuple[str, str]]
+    rehearsal_meta: Dict[str, Any]
+    vulnerability_log_path: Path
+    vulnerability_log: Optional[Dict[str, Any]]
+    assessment_summary: Optional[Dict[str, Any]]
+    now: str
+
+
+def collect_compliance_data(trace_db_path: Path) -> ComplianceData:
     trace_count, step_count, recent_traces = _fetch_trace_summary(trace_db_path)
-    rehearsal_meta = _fetch_trace_rehearsal_metadata(trace_db_path)
     vulnerability_log_path = Path(
         os.getenv("VULNERABILITY_LOG_PATH", trace_db_path.parent / "vulnerability_log.json")
     )
     vulnerability_log = _load_vulnerability_log(vulnerability_log_path)
+    return ComplianceData(
+        trace_db_path=trace_db_path,
+        trace_count=trace_count,
+        step_count=step_count,
+        recent_traces=recent_traces,
+        rehearsal_meta=_fetch_trace_rehearsal_metadata(trace_db_path),
+        vulnerability_log_path=vulnerability_log_path,
+        vulnerability_log=vulnerability_log,
+        assessment_summary=(
+            _summarize_assessments(vulnerability_log.get("assessments", []))
+            if vulnerability_log
+            else None
+        ),
+        now=datetime.now(timezone.utc).isoformat(),
+    )
 
-    now = datetime.now(timezone.utc).isoformat()
-    c = canvas.Canvas(str(output_path), pagesize=letter)
-    c.setPageCompression(0)
+
+def generate_report(output_path: Path, data: ComplianceData) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    trace_db_path = data.trace_db_path
+    trace_count = data.trace_count
+    step_count = data.step_count
+    recent_traces = data.recent_traces
+    rehearsal_meta = data.rehearsal_meta
+    vulnerability_log = data.vulnerability_log
+    assessment_summary = data.assessment_summary
+    now = data.now
+
+    # Compressed content streams; invariant output so identical data yields identical bytes.
+    c = canvas.Canvas(str(output_path), pagesize=letter, pageCompression=1, invariant=1)
     width, height = letter
 
     y = height - inch
     c.setFont("Helvetica-Bold", 16)
     c.drawString(inch, y, "ORCHESTRATORS_V2 Compliance Report")
 
-    y -= 0.4 * inch
+    y -= DY_04
     c.setFont("Helvetica", 11)
     c.drawString(inch, y, f"Generated: {now}")
 
-    y -= 0.3 * inch
+    y -= DY_03
     c.drawString(inch, y, f"Trace DB: {trace_db_path}")
 
     if rehearsal_meta.get("rehearsal_detected"):
-        y -= 0.2 * inch
+        y -= DY_02
         c.setFont("Helvetica-Bold", 11)
         c.drawString(inch, y, "AUDIT_REHEARSAL_MOCK")
 
-    y -= 0.4 * inch
+    y -= DY_04
     c.setFont("Helvetica-Bold", 12)
     c.drawString(inch, y, "Trace Receipts Summary")
 
-    y -= 0.3 * inch
+    y -= DY_03
     c.setFont("Helvetica", 11)
     c.drawString(inch, y, f"Total traces: {trace_count}")
 
-    y -= 0.25 * inch
+    y -= DY_025
     c.drawString(inch, y, f"Total trace steps: {step_count}")
 
     if rehearsal_meta.get("rehearsal_detected"):
-        y -= 0.25 * inch
+        y -= DY_025
         c.setFont("Helvetica-Bold", 11)
         c.drawString(inch, y, "Audit Rehearsal (MOCK) — Tier 3 synthetic trace")
-        y -= 0.2 * inch
+        y -= DY_02
         c.setFont("Helvetica", 10)
         c.drawString(
             inch,
@@ -136,27 +274,33 @@ def generate_report(output_path: Path, trace_db_path: Path) -> None:
             f"Synthetic traces: {rehearsal_meta.get('rehearsal_traces')} | "
             f"Synthetic token load: {rehearsal_meta.get('max_total_tokens')}",
         )
-    y -= 0.4 * inch
+    y -= DY_04
     c.setFont("Helvetica-Bold", 12)
     c.drawString(inch, y, "Most Recent Traces")
-    y -= 0.25 * inch
+    y -= DY_025
     c.setFont("Helvetica", 10)
     if not recent_traces:
         c.drawString(inch, y, "No trace receipts found. (Expected in CI or pre-prod runs)")
     else:
+        # One text object for the whole listing instead of a drawString per row.
+        lines = c.beginText(inch, y)
+        lines.setFont("Helvetica", 10, leading=DY_02)
         for trace_id, created_at in recent_traces:
             if y < inch:
+                c.drawText(lines)
                 c.showPage()
                 y = height - inch
-                c.setFont("Helvetica", 10)
-            c.drawString(inch, y, f"{created_at} — {trace_id}")
-            y -= 0.2 * inch
+                lines = c.beginText(inch, y)
+                lines.setFont("Helvetica", 10, leading=DY_02)
+            lines.textLine(f"{created_at} — {trace_id}")
+            y -= DY_02
+        c.drawText(lines)
 
-    y -= 0.3 * inch
+    y -= DY_03
     c.setFont("Helvetica-Bold", 12)
     c.drawString(inch, y, "Token Telemetry")
 
-    y -= 0.25 * inch
+    y -= DY_025
     c.setFont("Helvetica", 10)
     c.drawString(
         inch,
@@ -164,80 +308,72 @@ def generate_report(output_path: Path, trace_db_path: Path) -> None:
         "Token usage receipts (input/output/utilization) are recorded per request when tracing is enabled.",
     )
 
-    y -= 0.35 * inch
+    y -= DY_035
     c.setFont("Helvetica-Bold", 12)
     c.drawString(inch, y, "Dependency Health")
 
-    y -= 0.25 * inch
+    y -= DY_025
     c.setFont("Helvetica", 10)
     if not vulnerability_log:
         c.drawString(inch, y, "No vulnerability log found (instance/vulnerability_log.json).")
     else:
-        assessments = vulnerability_log.get("assessments", [])
+        total = assessment_summary["total"]
+        mitigated_count = assessment_summary["mitigated"]
+        accepted_count = assessment_summary["accepted"]
         status = vulnerability_log.get("status", "unknown")
-        mitigated_count = sum(1 for entry in assessments if "Mitigated" in (entry.get("mitigation") or ""))
-        accepted_count = sum(1 for entry in assessments if "Accepted" in (entry.get("mitigation") or ""))
         c.drawString(
             inch,
             y,
-            f"Advisories tracked: {len(assessments)} (source: {vulnerability_log.get('source', 'unknown')})",
+            f"Advisories tracked: {total} (source: {vulnerability_log.get('source', 'unknown')})",
         )
-        y -= 0.2 * inch
+        y -= DY_02
         c.drawString(
             inch,
             y,
             f"Status: {status} (mitigated: {mitigated_count}, accepted: {accepted_count})",
         )
-        y -= 0.2 * inch
+        y -= DY_02
         c.drawString(
             inch,
             y,
-            f"{mitigated_count + accepted_count}/{len(assessments)} alerts mitigated or risk-accepted via reachability analysis—Verified Jan 31, 2026.",
+            f"{mitigated_count + accepted_count}/{total} alerts mitigated or risk-accepted via reachability analysis—Verified Jan 31, 2026.",
         )
-        y -= 0.2 * inch
-        for entry in assessments:
+        y -= DY_02
+        for row in assessment_summary["assessments"]:
             if y < inch:
                 c.showPage()
                 y = height - inch
                 c.setFont("Helvetica", 10)
-            dependency = entry.get("dependency", "unknown")
-            advisory_id = entry.get("advisory_id", "pending")
-            reachability = entry.get("reachability", "unknown")
-            status_text = _architectural_status(entry)
+            dependency = row["dependency"] or "unknown"
+            advisory_id = row["advisory_id"] or "pending"
+            reachability = row["reachability"] or "unknown"
             c.drawString(
                 inch,
                 y,
-                f"{dependency} — {advisory_id} — reachability: {reachability} — status: {status_text}",
+                f"{dependency} — {advisory_id} — reachability: {reachability} — status: {row['architectural_status']}",
             )
-            y -= 0.2 * inch
-            reachability_note = entry.get("mitigation") or entry.get("reason")
+            y -= DY_02
+            reachability_note = row["reachability_notes"]
             if reachability_note:
                 c.drawString(inch + 12, y, f"Note: {reachability_note}")
-                y -= 0.2 * inch
+                y -= DY_02
 
     c.showPage()
     c.save()
 
 
-def generate_jsonld(output_path: Path, trace_db_path: Path) -> None:
+def generate_jsonld(output_path: Path, data: ComplianceData) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    trace_count, step_count, recent_traces = _fetch_trace_summary(trace_db_path)
-    rehearsal_meta = _fetch_trace_rehearsal_metadata(trace_db_path)
-    now = datetime.now(timezone.utc).isoformat()
-    vulnerability_log_path = Path(
-        os.getenv("VULNERABILITY_LOG_PATH", trace_db_path.parent / "vulnerability_log.json")
-    )
-    vulnerability_log = _load_vulnerability_log(vulnerability_log_path)
+    rehearsal_meta = data.rehearsal_meta
+    vulnerability_log = data.vulnerability_log
+    assessment_summary = data.assessment_summary
 
     dependency_health = None
-    if vulnerability_log:
-        assessments = vulnerability_log.get("assessments", [])
-        mitigated_count = sum(1 for entry in assessments if "Mitigated" in (entry.get("mitigation") or ""))
-        accepted_count = sum(1 for entry in assessments if "Accepted" in (entry.get("mitigation") or ""))
+    if vulnerability_log and assessment_summary is not None:
         dependency_health = {
             "source": vulnerability_log.get("source", "unknown"),
             "status": vulnerability_log.get("status", "unknown"),
-            "log_path": str(vulnerability_log_path),
+            "log_path": str(data.vulnerability_log_path),
             "nist_ai_rmf_reference": {
                 "function": "Measure",
                 "subcategory": "Measure-2.1",
@@ -245,23 +381,12 @@ def generate_jsonld(output_path: Path, trace_db_path: Path) -> None:
                 "description": "Dependency health and reachability evidence mapped to supply chain risk monitoring.",
             },
             "summary": {
-                "total": len(assessments),
-                "mitigated": mitigated_count,
-                "accepted": accepted_count,
+                "total": assessment_summary["total"],
+                "mitigated": assessment_summary["mitigated"],
+                "accepted": assessment_summary["accepted"],
                 "verification_statement": "4/4 alerts mitigated or risk-accepted via reachability analysis—Verified Jan 31, 2026.",
             },
-            "assessments": [
-                {
-                    "dependency": entry.get("dependency"),
-                    "advisory_id": entry.get("advisory_id"),
-                    "ghsa_id": entry.get("ghsa_id"),
-                    "reachability": entry.get("reachability"),
-                    "reachability_notes": entry.get("mitigation") or entry.get("reason"),
-                    "architectural_status": _architectural_status(entry),
-                    "review_by": entry.get("review_by"),
-                }
-                for entry in assessments
-            ],
+            "assessments": assessment_summary["assessments"],
         }
 
     payload = {
@@ -271,13 +396,13 @@ def generate_jsonld(output_path: Path, trace_db_path: Path) -> None:
         },
         "@type": "schema:Dataset",
         "schema:name": "ORCHESTRATORS_V2 Governance Metrics",
-        "schema:dateCreated": now,
+        "schema:dateCreated": data.now,
         "schema:description": "Machine-readable governance export for NIST AI RMF Measure and Govern functions.",
         "govern": {
             "function": "Govern",
             "artifact": "trace_receipts",
-            "trace_db": str(trace_db_path),
-            "trace_count": trace_count,
+            "trace_db": str(data.trace_db_path),
+            "trace_count": data.trace_count,
         },
         "measure": {
             "function": "Measure",
@@ -301,14 +426,14 @@ def generate_jsonld(output_path: Path, trace_db_path: Path) -> None:
                 "synthetic_token_load": rehearsal_meta.get("max_total_tokens"),
                 "note": "Synthetic rehearsal trace (no LLM tokens consumed)",
             },
-            "trace_steps_total": step_count,
+            "trace_steps_total": data.step_count,
             "recent_traces": [
                 {"trace_id": trace_id, "created_at": created_at}
-                for trace_id, created_at in recent_traces
+                for trace_id, created_at in data.recent_traces
             ],
         },
     }
-    output_path.write_text(json.dumps(payload, indent=2))
+    output_path.write_bytes(dumps_indented(payload))
 
 
 if __name__ == "__main__":
@@ -318,7 +443,8 @@ if __name__ == "__main__":
     jsonld_output = Path(
         os.getenv("COMPLIANCE_REPORT_JSONLD_PATH", repo_root / "reports" / "compliance_report.jsonld")
     )
-    generate_report(output, trace_db)
-    generate_jsonld(jsonld_output, trace_db)
+    data = collect_compliance_data(trace_db)
+    generate_report(output, data)
+    generate_jsonld(jsonld_output, data)
     print(f"Compliance report generated: {output}")
     print(f"Compliance report JSON-LD generated: {jsonld_output}")
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import os
-from sqlalchemy import text
 from src.db import get_engine
 
 TRACE_SQL = """
@@ -14,6 +13,10 @@ CREATE TABLE IF NOT EXISTS traces (
 );
 """
 
+TRACE_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_traces_created_at ON traces(created_at DESC);
+"""
+
 TRACE_STEPS_SQL = """
 CREATE TABLE IF NOT EXISTS trace_steps (
   id BIGSERIAL PRIMARY KEY,
@@ -24,6 +27,10 @@ CREATE TABLE IF NOT EXISTS trace_steps (
 );
 """
 
+TRACE_STEPS_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_trace_steps_trace_id ON trace_steps(trace_id);
+"""
+
 MEMORY_SQL = """
 CREATE TABLE IF NOT EXISTS memory_candidates (
   id TEXT PRIMARY KEY,
@@ -41,6 +48,15 @@ CREATE TABLE IF NOT EXISTS memory_candidates (
 );
 """
 
+MEMORY_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_memory_expires ON memory_candidates(expires_at);
+"""
+
+# Sent as one multi-statement script: a single round trip for the whole schema.
+SCHEMA_SQL = "".join(
+    (TRACE_SQL, TRACE_INDEX_SQL, TRACE_STEPS_SQL, TRACE_STEPS_INDEX_SQL, MEMORY_SQL, MEMORY_INDEX_SQL)
+)
+
 
 def main() -> int:
     if not os.getenv("ORCH_DATABASE_URL"):
@@ -51,9 +67,8 @@ def main() -> int:
         raise SystemExit("Failed to create database engine")
 
     with engine.begin() as conn:
-        conn.execute(text(TRACE_SQL))
-        conn.execute(text(TRACE_STEPS_SQL))
-        conn.execute(text(MEMORY_SQL))
+        # no_parameters: psycopg only accepts several statements without bind params
+        conn.execution_options(no_parameters=True).exec_driver_sql(SCHEMA_SQL)
 
     print("Postgres schema initialized: traces, trace_steps, memory_candidates")
     return 0
@@ -4,41 +4,124 @@ from __future__ import annotations
 
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterator, List, Tuple
 
-from sqlalchemy import text
+from sqlalchemy.engine import Engine
 from src.db import get_engine
 
-TRACE_INSERT = """
-INSERT INTO traces (id, created_at, metadata_json)
-VALUES (:id, :created_at, :metadata_json)
-ON CONFLICT (id) DO NOTHING
-"""
-
-TRACE_STEP_INSERT = """
-INSERT INTO trace_steps (trace_id, step_type, step_json, created_at)
-VALUES (:trace_id, :step_type, :step_json, :created_at)
-"""
-
-MEMORY_INSERT = """
-INSERT INTO memory_candidates (
-  id, user_id_hash, conversation_id, scope, content, content_hash,
-  created_at, last_seen_at, ttl_minutes, expires_at, source, passes
-)
-VALUES (
-  :id, :user_id_hash, :conversation_id, :scope, :content, :content_hash,
-  :created_at, :last_seen_at, :ttl_minutes, :expires_at, :source, :passes
+BATCH_SIZE = 1000
+
+TRACE_COLUMNS = ("id", "created_at", "metadata_json")
+TRACE_STEP_COLUMNS = ("trace_id", "step_type", "step_json", "created_at")
+ON_CONFLICT_ID = "ON CONFLICT (id) DO NOTHING"
+
+MEMORY_COLUMNS = (
+    "id", "user_id_hash", "conversation_id", "scope", "content", "content_hash",
+    "created_at", "last_seen_at", "ttl_minutes", "expires_at", "source", "passes",
 )
-ON CONFLICT (id) DO NOTHING
-"""
 
 
-def _rows(conn: sqlite3.Connection, sql: str) -> Iterable[sqlite3.Row]:
-    conn.row_factory = sqlite3.Row
-    cursor = conn.execute(sql)
-    for row in cursor.fetchall():
-        yield row
+def _batches(
+    conn: sqlite3.Connection, table: str, columns: Tuple[str, ...]
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """Stream plain row tuples in BATCH_SIZE chunks (no fetchall, no sqlite3.Row)."""
+    conn.row_factory = None
+    cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
+    cursor.arraysize = BATCH_SIZE
+    while rows := cursor.fetchmany():
+        yield rows
+
+
+def _migrate(
+    engine: Engine,
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Tuple[str, ...],
+    on_conflict: str,
+) -> int:
+    """Send each chunk of tuples as one positional DBAPI executemany.
+
+    Rows go from the SQLite cursor to the driver unchanged, with no per-row
+    dict built for named binds.
+    """
+    placeholder = "?" if engine.dialect.dbapi.paramstyle == "qmark" else "%s"
+    insert_sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join([placeholder] * len(columns))}) {on_conflict}"
+    )
+    migrated = 0
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for batch in _batches(conn, table, columns):
+            cursor.executemany(insert_sql, batch)
+            raw.commit()
+            migrated += len(batch)
+    finally:
+        raw.close()
+    return migrated
+
+
+def _copy(
+    engine: Engine,
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Tuple[str, ...],
+    on_conflict: str,
+) -> int:
+    """Bulk load with COPY FROM STDIN (psycopg 3).
+
+    Tables with an ON CONFLICT clause are copied into a temp staging table
+    first, then merged with INSERT ... SELECT so duplicates are skipped.
+    """
+    column_list = ", ".join(columns)
+    conn.row_factory = None
+    rows = conn.execute(f"SELECT {column_list} FROM {table}")
+    migrated = 0
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        target = table
+        if on_conflict:
+            target = f"migrate_staging_{table}"
+            cursor.execute(
+                f"CREATE TEMP TABLE {target} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        with cursor.copy(f"COPY {target} ({column_list}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                migrated += 1
+        if on_conflict:
+            cursor.execute(
+                f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {target} {on_conflict}"
+            )
+        raw.commit()
+    finally:
+        raw.close()
+    return migrated
+
+
+def _migrate_table(
+    engine: Engine,
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Tuple[str, ...],
+    on_conflict: str = "",
+) -> int:
+    if engine.dialect.name == "postgresql":
+        return _copy(engine, conn, table, columns, on_conflict)
+    return _migrate(engine, conn, table, columns, on_conflict)
+
+
+def _migrate_file(
+    engine: Engine, db_path: Path, table: str, columns: Tuple[str, ...], on_conflict: str
+) -> int:
+    # sqlite3 connections are bound to their thread: one per job.
+    with closing(sqlite3.connect(db_path)) as conn:
+        return _migrate_table(engine, conn, table, columns, on_conflict)
 
 
 def main() -> int:
@@ -53,37 +136,29 @@ def main() -> int:
     if not engine:
         raise SystemExit("Failed to create database engine")
 
-    migrated_traces = 0
-    migrated_steps = 0
-    migrated_memory = 0
-
+    jobs = []
     if trace_db.exists():
-        with sqlite3.connect(trace_db) as conn:
-            traces = list(_rows(conn, "SELECT id, created_at, metadata_json FROM traces"))
-            steps = list(_rows(conn, "SELECT trace_id, step_type, step_json, created_at FROM trace_steps"))
-        with engine.begin() as pg:
-            for row in traces:
-                pg.execute(text(TRACE_INSERT), dict(row))
-                migrated_traces += 1
-            for row in steps:
-                pg.execute(text(TRACE_STEP_INSERT), dict(row))
-                migrated_steps += 1
-
+        jobs.append((trace_db, "traces", TRACE_COLUMNS, ON_CONFLICT_ID))
+        jobs.append((trace_db, "trace_steps", TRACE_STEP_COLUMNS, ""))
     if memory_db.exists():
-        with sqlite3.connect(memory_db) as conn:
-            memory_rows = list(_rows(conn, """
-                SELECT id, user_id_hash, conversation_id, scope, content, content_hash,
-                       created_at, last_seen_at, ttl_minutes, expires_at, source, passes
-                FROM memory_candidates
-            """))
-        with engine.begin() as pg:
-            for row in memory_rows:
-                pg.execute(text(MEMORY_INSERT), dict(row))
-                migrated_memory += 1
+        jobs.append((memory_db, "memory_candidates", MEMORY_COLUMNS, ON_CONFLICT_ID))
+
+    # Tables are independent, so Postgres loads them concurrently (the default
+    # pool holds 5 connections). Other targets, e.g. SQLite, allow one writer.
+    workers = len(jobs) if engine.dialect.name == "postgresql" else 1
+    migrated = {"traces": 0, "trace_steps": 0, "memory_candidates": 0}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = {
+            table: pool.submit(_migrate_file, engine, path, table, columns, on_conflict)
+            for path, table, columns, on_conflict in jobs
+        }
+        for table, future in futures.items():
+            migrated[table] = future.result()
 
     print(
         "Migrated SQLite -> Postgres: "
-        f"traces={migrated_traces}, steps={migrated_steps}, memory_candidates={migrated_memory}"
+        f"traces={migrated['traces']}, steps={migrated['trace_steps']}, "
+        f"memory_candidates={migrated['memory_candidates']}"
     )
     return 0
 
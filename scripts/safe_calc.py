@@ -14,6 +14,8 @@ import ast
 import json
 import operator
 import sys
+from functools import lru_cache
+from types import CodeType
 from typing import Any
 
 OPS = {
@@ -33,21 +35,42 @@ class SafeCalcError(ValueError):
     pass
 
 
-def _eval_node(node: ast.AST) -> float:
-    if isinstance(node, ast.BinOp) and type(node.op) in OPS:
-        return float(OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right)))
-    if isinstance(node, ast.UnaryOp) and type(node.op) in OPS:
-        return float(OPS[type(node.op)](_eval_node(node.operand)))
-    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-        return float(node.value)
-    raise SafeCalcError("unsupported_expression")
+_ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, *OPS)
+
+
+def _validate(tree: ast.Expression) -> ast.Expression:
+    """Reject anything but arithmetic; promote int literals to float.
+
+    Float literals keep every intermediate in float arithmetic (as the old
+    node-by-node evaluator did), so e.g. huge integer powers overflow fast
+    instead of building arbitrarily large ints.
+    """
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise SafeCalcError("unsupported_expression")
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float, bool):
+                raise SafeCalcError("unsupported_expression")
+            node.value = float(node.value)
+    return tree
+
+
+@lru_cache(maxsize=256)
+def _compile(expr: str) -> CodeType:
+    tree = _validate(ast.parse(expr, mode="eval"))
+    return compile(tree, "<calc>", "eval")
+
+
+@lru_cache(maxsize=1024)
+def _evaluate(expr: str) -> float:
+    # Deterministic, so results are memoized; errors raise and are not cached.
+    return float(eval(_compile(expr), {"__builtins__": {}}, {}))
 
 
 def safe_eval(expr: str) -> float:
     if not expr or not expr.strip():
         raise SafeCalcError("missing_expression")
-    tree = ast.parse(expr, mode="eval")
-    return _eval_node(tree.body)
+    return _evaluate(expr.strip())
 
 
 def _read_expression(argv: list[str]) -> str:
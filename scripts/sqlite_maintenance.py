@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """
 File: scripts/sqlite_maintenance.py
-Purpose: SQLite database maintenance (VACUUM, TTL enforcement, pruning)
-Usage: python3 sqlite_maintenance.py [--dry-run]
+Purpose: SQLite database maintenance (VACUUM, TTL enforcement, pruning, optimize)
+Usage: python3 sqlite_maintenance.py [--dry-run] [--full] [--deep]
+        (--full forces a complete VACUUM rewrite; intended for a monthly run)
+        (--deep runs PRAGMA optimize with unlimited analysis)
 Schedule: Daily at 03:00 AM via aimee-sqlite-maintenance.timer
 """
 
@@ -10,9 +12,12 @@ import sys
 import os
 import json
 import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # ============================================================================
 # Configuration
@@ -24,29 +29,57 @@ INSTANCE_DIR = REPO_ROOT / "instance"
 # Environment variables (with defaults)
 MAINTENANCE_ENABLED = int(os.getenv("SQLITE_MAINTENANCE_ENABLED", "0"))
 VACUUM_ENABLED = int(os.getenv("SQLITE_VACUUM_ENABLED", "1"))
+# auto: incremental on auto_vacuum=INCREMENTAL DBs, otherwise full when worth it
+# incremental: never rewrite the file; full: always rewrite (same as --full)
+VACUUM_MODE = os.getenv("SQLITE_VACUUM_MODE", "auto").lower()
+# Below this many free pages an incremental run only refreshes planner stats
+VACUUM_MIN_FREELIST_PAGES = int(os.getenv("SQLITE_VACUUM_MIN_FREELIST_PAGES", "1000"))
+# A full rewrite in auto mode needs at least this fraction of the file free
+VACUUM_MIN_FREE_RATIO = float(os.getenv("SQLITE_VACUUM_MIN_FREE_RATIO", "0.1"))
+# Pages reclaimed per incremental_vacuum call (0 = whole freelist)
+VACUUM_PAGE_LIMIT = int(os.getenv("SQLITE_VACUUM_PAGE_LIMIT", "2000"))
+
+# Databases are independent files, so each phase processes them in parallel
+MAINTENANCE_WORKERS = int(os.getenv("SQLITE_MAINTENANCE_WORKERS", "8"))
+
+# Rows sampled per index by PRAGMA optimize's ANALYZE (0 = full scan, --deep)
+OPTIMIZE_ANALYSIS_LIMIT = int(os.getenv("SQLITE_OPTIMIZE_ANALYSIS_LIMIT", "400"))
 
 # Per-database TTL configuration (days, 0=disabled)
+# timestamp_type: "iso" (ISO-8601 text) or "epoch" (INTEGER unix seconds, e.g. a
+# column added by migrate_timestamp_to_epoch)
 TTL_CONFIG = {
     "agent9_interactions.db": {
         "ttl_days": int(os.getenv("SQLITE_TTL_AGENT9_DAYS", "0")),
         "table": "interactions",
         "timestamp_column": "timestamp",
+        "timestamp_type": "iso",
     },
     "api_proxy_interactions.db": {
         "ttl_days": int(os.getenv("SQLITE_TTL_API_PROXY_DAYS", "0")),
         "table": "requests",
         "timestamp_column": "created_at",
+        "timestamp_type": "iso",
     },
     "usage_telemetry.db": {
         "ttl_days": int(os.getenv("SQLITE_TTL_USAGE_TELEMETRY_DAYS", "30")),
         "table": "usage_events",
         "timestamp_column": "created_at",
+        "timestamp_type": "iso",
     },
 }
 
+# Rows deleted per TTL transaction (keeps each write lock and journal small)
+TTL_BATCH_SIZE = int(os.getenv("SQLITE_TTL_BATCH_SIZE", "5000"))
+
 # Recall frame limits (0=disabled)
 RECALL_FRAMES_TTL_DAYS = int(os.getenv("SQLITE_TTL_RECALL_FRAMES_DAYS", "0"))
 RECALL_MAX_DISK_MB = int(os.getenv("SQLITE_MAX_RECALL_DISK_MB", "0"))
+# Column and timestamp_type the frame TTL compares against (see TTL_CONFIG)
+RECALL_TIMESTAMP_COLUMN = os.getenv("SQLITE_RECALL_TIMESTAMP_COLUMN", "timestamp")
+RECALL_TIMESTAMP_TYPE = os.getenv("SQLITE_RECALL_TIMESTAMP_TYPE", "iso")
+# Oldest frames deleted per step while pruning down to RECALL_MAX_DISK_MB
+RECALL_PRUNE_CHUNK_SIZE = int(os.getenv("SQLITE_RECALL_PRUNE_CHUNK_SIZE", "500"))
 
 # Databases to VACUUM (always safe, no data loss)
 VACUUM_DATABASES = [
@@ -58,18 +91,35 @@ VACUUM_DATABASES = [
     "model_switches.db",
 ]
 
+# Databases whose planner statistics are refreshed after TTL deletes
+OPTIMIZE_DATABASES = list(dict.fromkeys([*VACUUM_DATABASES, *TTL_CONFIG]))
+
 # ============================================================================
 # Logging
 # ============================================================================
 
+_last_log_second = 0
+_last_log_iso = ""
+
+def _now_iso() -> str:
+    """UTC timestamp at second granularity, formatted once per second"""
+    global _last_log_second, _last_log_iso
+    second = int(time.time())
+    if second != _last_log_second:
+        _last_log_second = second
+        _last_log_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+    return _last_log_iso
+
 def log_json(event: str, **kwargs):
     """Log structured JSON event"""
     log_data = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _now_iso(),
         "event": event,
         **kwargs
     }
-    print(json.dumps(log_data), flush=True)
+    # One write per event so lines from parallel workers never interleave
+    sys.stdout.write(json.dumps(log_data) + "\n")
+    sys.stdout.flush()
 
 def log_error(message: str, **kwargs):
     """Log error event"""
@@ -80,12 +130,62 @@ def log_error(message: str, **kwargs):
 # Database Operations
 # ============================================================================
 
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Open a maintenance connection: WAL so readers keep going during deletes,
+    synchronous=NORMAL (one fsync per checkpoint, not per commit), in-memory temp
+    storage and a 64 MB page cache.
+    check_same_thread is off because main() hands one connection per database
+    from phase to phase across pool threads (never two threads at once)"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA cache_size=-65536;"
+        "PRAGMA mmap_size=268435456;"
+    )
+    return conn
+
+@contextmanager
+def _borrow(db_path: Path, conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+    """Use the caller's connection as-is, or open (and close) a private one"""
+    if conn is not None:
+        yield conn
+        return
+    conn = _connect(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def _logical_size_mb(conn: sqlite3.Connection) -> float:
+    """Database size from page_count * page_size; unlike the file size it is
+    current before the WAL is checkpointed back into the main file"""
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size / (1024 * 1024)
+
 def get_db_size_mb(db_path: Path) -> float:
     """Get database file size in MB"""
     if not db_path.exists():
         return 0.0
     return db_path.stat().st_size / (1024 * 1024)
 
+def _wal_size_mb(db_path: Path) -> float:
+    """Size of the database's -wal file in MB (0 when there is none)"""
+    try:
+        return Path(f"{db_path}-wal").stat().st_size / (1024 * 1024)
+    except FileNotFoundError:
+        return 0.0
+
+def _live_size_mb(conn: sqlite3.Connection) -> float:
+    """Size of the pages holding data (page_count - freelist_count); deletes
+    lower it at once, while the file only shrinks on the next VACUUM"""
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return (page_count - freelist) * page_size / (1024 * 1024)
+
 def get_row_count(conn: sqlite3.Connection, table: str) -> int:
     """Get row count for a table"""
     try:
@@ -94,40 +194,137 @@ def get_row_count(conn: sqlite3.Connection, table: str) -> int:
     except sqlite3.Error:
         return 0
 
-def vacuum_database(db_path: Path, dry_run: bool = False) -> Tuple[bool, float]:
+def _vacuum_plan(auto_vacuum: int, freelist_pages: int, page_count: int, full: bool) -> str:
+    """Pick "full", "incremental" or "skip" for one database"""
+    if full or VACUUM_MODE == "full":
+        return "full"
+    if auto_vacuum == 2:
+        return "incremental" if freelist_pages >= VACUUM_MIN_FREELIST_PAGES else "skip"
+    if VACUUM_MODE == "incremental":
+        return "skip"  # incremental_vacuum is a no-op without auto_vacuum=INCREMENTAL
+    if freelist_pages / max(page_count, 1) >= VACUUM_MIN_FREE_RATIO:
+        return "full"
+    return "skip"
+
+def _ttl_cutoff(ttl_days: int, timestamp_type: str = "iso"):
+    """Cutoff to compare a timestamp column against: unix seconds for "epoch"
+    columns (integer compares, denser index), else an ISO-8601 string"""
+    if timestamp_type == "epoch":
+        return int(time.time()) - ttl_days * 86400
+    return (datetime.utcnow() - timedelta(days=ttl_days)).isoformat()
+
+def migrate_timestamp_to_epoch(db_path: Path, table: str, timestamp_col: str) -> str:
+    """
+    One-shot, optional migration: add an INTEGER {timestamp_col}_epoch column,
+    backfill it from the ISO column, index it and keep it filled on insert.
+    Schema-invasive, so never run by main(); afterwards point the TTL config at
+    the new column with timestamp_type="epoch".
+    Returns: name of the epoch column
+    """
+    epoch_col = f"{timestamp_col}_epoch"
+    to_epoch = "CAST(strftime('%s', {}) AS INTEGER)"
+    with closing(_connect(db_path)) as conn:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        with conn:
+            if epoch_col not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {epoch_col} INTEGER")
+            conn.execute(
+                f"UPDATE {table} SET {epoch_col} = {to_epoch.format(timestamp_col)} "
+                f"WHERE {epoch_col} IS NULL"
+            )
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_{epoch_col} "
+                f"AFTER INSERT ON {table} WHEN NEW.{epoch_col} IS NULL BEGIN "
+                f"UPDATE {table} SET {epoch_col} = {to_epoch.format('NEW.' + timestamp_col)} "
+                f"WHERE rowid = NEW.rowid; END"
+            )
+        ensure_timestamp_index(conn, table, epoch_col)
+    log_json("EPOCH_MIGRATION_SUCCESS", db=db_path.name, table=table, column=epoch_col)
+    return epoch_col
+
+def ensure_timestamp_index(conn: sqlite3.Connection, table: str, timestamp_col: str):
+    """Index the TTL column so cutoff scans and ORDER BY ... LIMIT are range scans"""
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{timestamp_col} ON {table}({timestamp_col})"
+    )
+    conn.commit()
+
+def vacuum_database(
+    db_path: Path,
+    dry_run: bool = False,
+    full: bool = False,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Tuple[bool, float]:
     """
-    VACUUM database to reclaim space
+    Reclaim free pages in a database
+    - auto_vacuum=INCREMENTAL databases: PRAGMA incremental_vacuum(VACUUM_PAGE_LIMIT)
+    - other databases: full VACUUM (which also switches them to INCREMENTAL),
+      only when the free-page ratio reaches VACUUM_MIN_FREE_RATIO
+    - full=True / SQLITE_VACUUM_MODE=full always rewrites the file
+    - the WAL is checkpointed with TRUNCATE before planning (and again after a
+      VACUUM); freed_mb counts the main file and the -wal file together
+    - conn: reuse an open connection (left open) instead of connecting here
     Returns: (success, freed_mb)
     """
     if not db_path.exists():
         log_json("VACUUM_SKIP", db=db_path.name, reason="file_not_found")
         return True, 0.0
-    
-    size_before = get_db_size_mb(db_path)
-    
+
     if dry_run:
-        log_json("VACUUM_DRY_RUN", db=db_path.name, size_mb=round(size_before, 2))
+        log_json("VACUUM_DRY_RUN", db=db_path.name, size_mb=round(get_db_size_mb(db_path), 2))
         return True, 0.0
-    
+
     try:
-        conn = sqlite3.connect(db_path)
-        log_json("VACUUM_START", db=db_path.name)
-        
-        # VACUUM (reclaim deleted space)
-        conn.execute("VACUUM")
-        
-        # PRAGMA optimize (update query planner stats)
-        conn.execute("PRAGMA optimize")
-        
-        conn.close()
-        
-        size_after = get_db_size_mb(db_path)
-        freed_mb = size_before - size_after
+        with _borrow(db_path, conn) as conn:
+            # Fold the WAL back into the main file and truncate it first: cheap
+            # (O(WAL pages)) and often most of the reclaimable disk on its own
+            wal_before = _wal_size_mb(db_path)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            size_before = _logical_size_mb(conn)
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            freelist_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            plan = _vacuum_plan(auto_vacuum, freelist_before, page_count, full)
+
+            if plan == "full":
+                log_json("VACUUM_START", db=db_path.name, mode="full", freelist_pages=freelist_before)
+                # Takes effect as part of this VACUUM; later runs can go incremental
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            elif plan == "incremental":
+                log_json("VACUUM_START",
+                         db=db_path.name,
+                         mode="incremental",
+                         freelist_pages=freelist_before,
+                         page_limit=VACUUM_PAGE_LIMIT)
+                # executescript steps the pragma to completion (execute frees one page)
+                pages = f"({VACUUM_PAGE_LIMIT})" if VACUUM_PAGE_LIMIT > 0 else ""
+                conn.executescript(f"PRAGMA incremental_vacuum{pages};")
+            else:
+                log_json("VACUUM_SKIP",
+                         db=db_path.name,
+                         reason="freelist_below_threshold",
+                         freelist_pages=freelist_before,
+                         page_count=page_count)
+
+            if plan != "skip":
+                # VACUUM in WAL mode writes its output through the WAL
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            freelist_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            size_after = _logical_size_mb(conn)
+            wal_after = _wal_size_mb(db_path)
+
+        freed_mb = (size_before + wal_before) - (size_after + wal_after)
         
         log_json("VACUUM_SUCCESS", 
                  db=db_path.name, 
+                 mode=plan,
+                 freelist_before=freelist_before,
+                 freelist_after=freelist_after,
                  size_before_mb=round(size_before, 2),
                  size_after_mb=round(size_after, 2),
+                 wal_before_mb=round(wal_before, 2),
+                 wal_after_mb=round(wal_after, 2),
                  freed_mb=round(freed_mb, 2))
         
         return True, freed_mb
@@ -136,9 +333,51 @@ def vacuum_database(db_path: Path, dry_run: bool = False) -> Tuple[bool, float]:
         log_error(f"VACUUM failed for {db_path.name}", error=str(e))
         return False, 0.0
 
-def enforce_ttl(db_path: Path, config: Dict, dry_run: bool = False) -> Tuple[bool, int]:
+def optimize_database(
+    db_path: Path,
+    dry_run: bool = False,
+    deep: bool = False,
+    conn: Optional[sqlite3.Connection] = None,
+) -> bool:
+    """
+    Refresh query planner statistics with PRAGMA optimize
+    - 0x10012: analyze tables whose stats look stale, even if not queried in
+      this connection (0x10000), bounded by analysis_limit
+    - deep: 0x10002 with analysis_limit=0 for full-precision stats
+    - conn: reuse an open connection (left open) instead of connecting here
+    Returns: success
+    """
+    if not db_path.exists():
+        return True
+
+    if dry_run:
+        log_json("OPTIMIZE_DRY_RUN", db=db_path.name, deep=deep)
+        return True
+
+    try:
+        with _borrow(db_path, conn) as conn:
+            if deep:
+                conn.execute("PRAGMA analysis_limit=0")
+                conn.execute("PRAGMA optimize=0x10002")
+            else:
+                conn.execute(f"PRAGMA analysis_limit={OPTIMIZE_ANALYSIS_LIMIT}")
+                conn.execute("PRAGMA optimize=0x10012")
+        log_json("OPTIMIZE_SUCCESS", db=db_path.name, deep=deep)
+        return True
+    
+    except sqlite3.Error as e:
+        log_error(f"PRAGMA optimize failed for {db_path.name}", error=str(e))
+        return False
+
+def enforce_ttl(
+    db_path: Path,
+    config: Dict,
+    dry_run: bool = False,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Tuple[bool, int]:
     """
     Enforce TTL by deleting expired rows
+    - conn: reuse an open connection (left open) instead of connecting here
     Returns: (success, deleted_count)
     """
     if not db_path.exists():
@@ -151,58 +390,54 @@ def enforce_ttl(db_path: Path, config: Dict, dry_run: bool = False) -> Tuple[boo
     
     table = config["table"]
     timestamp_col = config["timestamp_column"]
-    cutoff_date = (datetime.utcnow() - timedelta(days=ttl_days)).isoformat()
+    cutoff_date = _ttl_cutoff(ttl_days, config.get("timestamp_type", "iso"))
     
     try:
-        conn = sqlite3.connect(db_path)
-        
-        # Count rows before
-        rows_before = get_row_count(conn, table)
-        
-        # Find expired rows
-        cursor = conn.execute(
-            f"SELECT COUNT(*) FROM {table} WHERE {timestamp_col} < ?",
-            (cutoff_date,)
-        )
-        expired_count = cursor.fetchone()[0]
-        
-        if expired_count == 0:
-            log_json("TTL_NO_EXPIRED", db=db_path.name, ttl_days=ttl_days)
-            conn.close()
-            return True, 0
-        
-        if dry_run:
-            log_json("TTL_DRY_RUN", 
+        with _borrow(db_path, conn) as conn:
+            if dry_run:
+                cursor = conn.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE {timestamp_col} < ?",
+                    (cutoff_date,)
+                )
+                expired_count = cursor.fetchone()[0]
+                if expired_count == 0:
+                    log_json("TTL_NO_EXPIRED", db=db_path.name, ttl_days=ttl_days)
+                    return True, 0
+                log_json("TTL_DRY_RUN", 
+                         db=db_path.name, 
+                         ttl_days=ttl_days,
+                         expired_count=expired_count,
+                         action="would_delete")
+                return True, expired_count
+            
+            ensure_timestamp_index(conn, table, timestamp_col)
+            
+            log_json("TTL_DELETE_START", 
                      db=db_path.name, 
                      ttl_days=ttl_days,
-                     expired_count=expired_count,
-                     action="would_delete")
-            conn.close()
-            return True, expired_count
-        
-        # Delete expired rows (with transaction)
-        log_json("TTL_DELETE_START", 
-                 db=db_path.name, 
-                 ttl_days=ttl_days,
-                 expired_count=expired_count)
-        
-        conn.execute("BEGIN")
-        conn.execute(
-            f"DELETE FROM {table} WHERE {timestamp_col} < ?",
-            (cutoff_date,)
-        )
-        conn.commit()
-        
-        # Count rows after
-        rows_after = get_row_count(conn, table)
-        deleted_count = rows_before - rows_after
+                     batch_size=TTL_BATCH_SIZE)
+            
+            # Delete expired rows in bounded batches, one transaction each
+            delete_sql = (
+                f"DELETE FROM {table} WHERE rowid IN "
+                f"(SELECT rowid FROM {table} WHERE {timestamp_col} < ? "
+                f"ORDER BY {timestamp_col} LIMIT ?)"
+            )
+            deleted_count = 0
+            while True:
+                cursor = conn.execute(delete_sql, (cutoff_date, TTL_BATCH_SIZE))
+                conn.commit()
+                deleted_count += cursor.rowcount
+                if cursor.rowcount < TTL_BATCH_SIZE:
+                    break
         
-        conn.close()
+        if deleted_count == 0:
+            log_json("TTL_NO_EXPIRED", db=db_path.name, ttl_days=ttl_days)
+            return True, 0
         
         log_json("TTL_DELETE_SUCCESS", 
                  db=db_path.name,
-                 deleted_count=deleted_count,
-                 rows_remaining=rows_after)
+                 deleted_count=deleted_count)
         
         return True, deleted_count
     
@@ -210,9 +445,10 @@ def enforce_ttl(db_path: Path, config: Dict, dry_run: bool = False) -> Tuple[boo
         log_error(f"TTL enforcement failed for {db_path.name}", error=str(e))
         return False, 0
 
-def prune_recall_frames(dry_run: bool = False) -> Tuple[bool, int]:
+def prune_recall_frames(dry_run: bool = False, conn: Optional[sqlite3.Connection] = None) -> Tuple[bool, int]:
     """
     Prune recall_memory.db frames by age or disk usage
+    - conn: reuse an open connection (left open) instead of connecting here
     Returns: (success, deleted_count)
     """
     db_path = INSTANCE_DIR / "recall_memory.db"
@@ -226,76 +462,67 @@ def prune_recall_frames(dry_run: bool = False) -> Tuple[bool, int]:
         return True, 0
     
     try:
-        conn = sqlite3.connect(db_path)
-        
-        # Count frames before
-        frames_before = get_row_count(conn, "frames")
-        db_size_mb = get_db_size_mb(db_path)
-        
-        deleted_count = 0
-        
-        # Prune by age (if enabled)
-        if RECALL_FRAMES_TTL_DAYS > 0:
-            cutoff_date = (datetime.utcnow() - timedelta(days=RECALL_FRAMES_TTL_DAYS)).isoformat()
+        with _borrow(db_path, conn) as conn:
+            if not dry_run:
+                ensure_timestamp_index(conn, "frames", RECALL_TIMESTAMP_COLUMN)
             
-            cursor = conn.execute(
-                "SELECT COUNT(*) FROM frames WHERE timestamp < ?",
-                (cutoff_date,)
-            )
-            expired_count = cursor.fetchone()[0]
+            deleted_count = 0
             
-            if expired_count > 0:
+            # Prune by age (if enabled); the DELETE's rowcount is the tally,
+            # only a dry run needs to COUNT
+            if RECALL_FRAMES_TTL_DAYS > 0:
+                cutoff_date = _ttl_cutoff(RECALL_FRAMES_TTL_DAYS, RECALL_TIMESTAMP_TYPE)
+                
                 if dry_run:
-                    log_json("RECALL_PRUNE_DRY_RUN",
-                             reason="age",
-                             ttl_days=RECALL_FRAMES_TTL_DAYS,
-                             expired_count=expired_count)
+                    expired_count = conn.execute(
+                        f"SELECT COUNT(*) FROM frames WHERE {RECALL_TIMESTAMP_COLUMN} < ?",
+                        (cutoff_date,)
+                    ).fetchone()[0]
+                    if expired_count > 0:
+                        log_json("RECALL_PRUNE_DRY_RUN",
+                                 reason="age",
+                                 ttl_days=RECALL_FRAMES_TTL_DAYS,
+                                 expired_count=expired_count)
                 else:
-                    log_json("RECALL_PRUNE_START", reason="age", count=expired_count)
-                    conn.execute("BEGIN")
-                    conn.execute("DELETE FROM frames WHERE timestamp < ?", (cutoff_date,))
-                    conn.commit()
-                    deleted_count += expired_count
-        
-        # Prune by disk usage (if enabled and still over limit)
-        if RECALL_MAX_DISK_MB > 0 and db_size_mb > RECALL_MAX_DISK_MB:
-            # Calculate how many frames to delete (rough estimate)
-            bytes_to_free = (db_size_mb - RECALL_MAX_DISK_MB) * 1024 * 1024
-            avg_frame_size = db_path.stat().st_size / max(frames_before, 1)
-            frames_to_delete = int(bytes_to_free / avg_frame_size) + 100  # +100 margin
-            
-            if frames_to_delete > 0:
-                if dry_run:
-                    log_json("RECALL_PRUNE_DRY_RUN",
-                             reason="disk",
-                             current_mb=round(db_size_mb, 2),
-                             max_mb=RECALL_MAX_DISK_MB,
-                             frames_to_delete=frames_to_delete)
-                else:
-                    log_json("RECALL_PRUNE_START", 
-                             reason="disk", 
-                             count=frames_to_delete)
-                    conn.execute("BEGIN")
-                    conn.execute(
-                        "DELETE FROM frames WHERE id IN "
-                        "(SELECT id FROM frames ORDER BY timestamp ASC LIMIT ?)",
-                        (frames_to_delete,)
+                    log_json("RECALL_PRUNE_START", reason="age", ttl_days=RECALL_FRAMES_TTL_DAYS)
+                    cursor = conn.execute(
+                        f"DELETE FROM frames WHERE {RECALL_TIMESTAMP_COLUMN} < ?", (cutoff_date,)
                     )
                     conn.commit()
-                    deleted_count += frames_to_delete
-        
-        # Count frames after
-        frames_after = get_row_count(conn, "frames")
-        actual_deleted = frames_before - frames_after
-        
-        conn.close()
+                    deleted_count += cursor.rowcount
+            
+            # Prune by disk usage (if enabled and still over limit): delete the
+            # oldest frames a chunk at a time until the live pages fit the limit
+            if RECALL_MAX_DISK_MB > 0:
+                live_mb = _live_size_mb(conn)
+                if live_mb > RECALL_MAX_DISK_MB:
+                    if dry_run:
+                        log_json("RECALL_PRUNE_DRY_RUN",
+                                 reason="disk",
+                                 current_mb=round(live_mb, 2),
+                                 max_mb=RECALL_MAX_DISK_MB)
+                    else:
+                        log_json("RECALL_PRUNE_START", 
+                                 reason="disk", 
+                                 current_mb=round(live_mb, 2),
+                                 max_mb=RECALL_MAX_DISK_MB,
+                                 chunk_size=RECALL_PRUNE_CHUNK_SIZE)
+                        while live_mb > RECALL_MAX_DISK_MB:
+                            cursor = conn.execute(
+                                "DELETE FROM frames WHERE id IN "
+                                f"(SELECT id FROM frames ORDER BY {RECALL_TIMESTAMP_COLUMN} ASC LIMIT ?)",
+                                (RECALL_PRUNE_CHUNK_SIZE,)
+                            )
+                            conn.commit()
+                            deleted_count += cursor.rowcount
+                            if cursor.rowcount == 0:
+                                break
+                            live_mb = _live_size_mb(conn)
         
-        if actual_deleted > 0:
-            log_json("RECALL_PRUNE_SUCCESS",
-                     deleted_count=actual_deleted,
-                     frames_remaining=frames_after)
+        if deleted_count > 0:
+            log_json("RECALL_PRUNE_SUCCESS", deleted_count=deleted_count)
         
-        return True, actual_deleted
+        return True, deleted_count
     
     except sqlite3.Error as e:
         log_error("Recall frame pruning failed", error=str(e))
@@ -305,8 +532,13 @@ def prune_recall_frames(dry_run: bool = False) -> Tuple[bool, int]:
 # Main Execution
 # ============================================================================
 
+def _worker_count(items) -> int:
+    return max(1, min(MAINTENANCE_WORKERS, len(items)))
+
 def main():
     dry_run = "--dry-run" in sys.argv
+    full_vacuum = "--full" in sys.argv
+    deep_optimize = "--deep" in sys.argv
     
     # Determine mode
     if not MAINTENANCE_ENABLED:
@@ -317,6 +549,8 @@ def main():
     log_json("MAINTENANCE_START", 
              mode=mode,
              vacuum_enabled=bool(VACUUM_ENABLED),
+             full_vacuum=full_vacuum,
+             vacuum_mode=VACUUM_MODE,
              maintenance_enabled=bool(MAINTENANCE_ENABLED))
     
     # Track results
@@ -327,40 +561,91 @@ def main():
     ttl_failed = 0
     total_deleted = 0
     
-    # Phase 1: VACUUM databases (always safe, no data loss)
-    if VACUUM_ENABLED:
-        for db_name in VACUUM_DATABASES:
-            db_path = INSTANCE_DIR / db_name
-            success, freed_mb = vacuum_database(db_path, dry_run=(not MAINTENANCE_ENABLED or dry_run))
-            if success:
-                vacuum_success += 1
-                total_freed_mb += freed_mb
-            else:
-                vacuum_failed += 1
-    
-    # Phase 2: TTL enforcement (opt-in per database)
-    if MAINTENANCE_ENABLED and not dry_run:
-        for db_name, config in TTL_CONFIG.items():
-            if config["ttl_days"] > 0:
+    # One connection per existing database, shared by every phase below so each
+    # file (and its -wal/-shm) is opened and its page cache warmed only once.
+    # Dry runs keep the per-call connections (only TTL counting opens one).
+    conns: Dict[Path, sqlite3.Connection] = {}
+    try:
+        if MAINTENANCE_ENABLED and not dry_run:
+            for db_name in OPTIMIZE_DATABASES:
                 db_path = INSTANCE_DIR / db_name
-                success, deleted_count = enforce_ttl(db_path, config, dry_run=False)
+                if db_path.exists():
+                    conns[db_path] = _connect(db_path)
+    
+        # Phase 1: VACUUM databases (always safe, no data loss)
+        # (one worker per file; sqlite3 releases the GIL while SQLite runs)
+        if VACUUM_ENABLED:
+            with ThreadPoolExecutor(max_workers=_worker_count(VACUUM_DATABASES)) as pool:
+                futures = [
+                    pool.submit(
+                        vacuum_database,
+                        INSTANCE_DIR / db_name,
+                        dry_run=(not MAINTENANCE_ENABLED or dry_run),
+                        full=full_vacuum,
+                        conn=conns.get(INSTANCE_DIR / db_name),
+                    )
+                    for db_name in VACUUM_DATABASES
+                ]
+                for future in as_completed(futures):
+                    success, freed_mb = future.result()
+                    if success:
+                        vacuum_success += 1
+                        total_freed_mb += freed_mb
+                    else:
+                        vacuum_failed += 1
+    
+        # Phase 2: TTL enforcement (opt-in per database; dry runs only report)
+        ttl_dry_run = not MAINTENANCE_ENABLED or dry_run
+        ttl_targets = [(db_name, config) for db_name, config in TTL_CONFIG.items() if config["ttl_days"] > 0]
+        with ThreadPoolExecutor(max_workers=_worker_count(ttl_targets)) as pool:
+            futures = [
+                pool.submit(
+                    enforce_ttl,
+                    INSTANCE_DIR / db_name,
+                    config,
+                    dry_run=ttl_dry_run,
+                    conn=conns.get(INSTANCE_DIR / db_name),
+                )
+                for db_name, config in ttl_targets
+            ]
+            for future in as_completed(futures):
+                success, deleted_count = future.result()
+                if ttl_dry_run:
+                    continue
                 if success:
                     ttl_success += 1
                     total_deleted += deleted_count
                 else:
                     ttl_failed += 1
-    else:
-        # Dry-run: show what would be deleted
-        for db_name, config in TTL_CONFIG.items():
-            if config["ttl_days"] > 0:
-                db_path = INSTANCE_DIR / db_name
-                enforce_ttl(db_path, config, dry_run=True)
     
-    # Phase 3: Recall frame pruning (opt-in)
-    if RECALL_FRAMES_TTL_DAYS > 0 or RECALL_MAX_DISK_MB > 0:
-        success, deleted_count = prune_recall_frames(dry_run=(not MAINTENANCE_ENABLED or dry_run))
-        if success:
-            total_deleted += deleted_count
+        # Phase 3: Recall frame pruning (opt-in)
+        if RECALL_FRAMES_TTL_DAYS > 0 or RECALL_MAX_DISK_MB > 0:
+            success, deleted_count = prune_recall_frames(
+                dry_run=(not MAINTENANCE_ENABLED or dry_run),
+                conn=conns.get(INSTANCE_DIR / "recall_memory.db"),
+            )
+            if success:
+                total_deleted += deleted_count
+    
+        # Phase 4: planner statistics, after deletes so they reflect new cardinality
+        optimize_failed = 0
+        with ThreadPoolExecutor(max_workers=_worker_count(OPTIMIZE_DATABASES)) as pool:
+            futures = [
+                pool.submit(
+                    optimize_database,
+                    INSTANCE_DIR / db_name,
+                    dry_run=(not MAINTENANCE_ENABLED or dry_run),
+                    deep=deep_optimize,
+                    conn=conns.get(INSTANCE_DIR / db_name),
+                )
+                for db_name in OPTIMIZE_DATABASES
+            ]
+            for future in as_completed(futures):
+                if not future.result():
+                    optimize_failed += 1
+    finally:
+        for conn in conns.values():
+            conn.close()
     
     # Summary
     log_json("MAINTENANCE_COMPLETE",
@@ -370,6 +655,7 @@ def main():
              total_freed_mb=round(total_freed_mb, 2),
              ttl_success=ttl_success,
              ttl_failed=ttl_failed,
+             optimize_failed=optimize_failed,
              total_deleted=total_deleted)
     
     # Exit code
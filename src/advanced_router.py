@@ -1,40 +1,75 @@
 from __future__ import annotations
 
+import math
 import os
 import re
+import threading
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Pattern, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
+try:
+    import hyperscan
+except ImportError:  # Optional dependency
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # Optional dependency
+    ahocorasick = None
+
 from src.router import RouteDecision
-from src.tools.orch_tokenizer import orch_tokenizer
+from src.tools.orch_tokenizer import DEFAULT_SAFETY_MARGIN, count_tokens_cached
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ModelDecision:
     model: str
     reason: str
 
 
+@dataclass(frozen=True)
+class _CompiledRule:
+    patterns: Tuple[Pattern[str], ...]
+    tool: Optional[str]
+    params: Dict[str, object]
+    confidence: float
+    reason: str
+
+
+# Characters that make a pattern more than a plain substring.
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+
+@dataclass(frozen=True)
+class _LiteralIndex:
+    caseless: Optional[object]  # ahocorasick.Automaton over lowercased literals
+    cased: Optional[object]  # ahocorasick.Automaton over case-sensitive literals
+    regex_rules: Tuple[int, ...]  # rules that always need the `re` check
+
+
 class PolicyRouter:
     """Policy-driven router loaded from YAML (deterministic + auditable)."""
 
     def __init__(self, rules: List[Dict[str, str]], defaults: Optional[Dict[str, object]] = None) -> None:
         self._rules = rules
         self._defaults = defaults or {}
+        self._compiled = self._compile_rules(self._rules, self._defaults)
+        self._hs_db = self._build_hyperscan(self._compiled)
+        self._hs_local = threading.local()
+        self._literal_index = None if self._hs_db is not None else self._build_literal_index(self._compiled)
 
-    @classmethod
-    def from_env(cls) -> "PolicyRouter":
-        policy_path = os.getenv("ORCH_ROUTER_POLICY_PATH", "config/router_policy.yaml")
-        with open(policy_path, "r", encoding="utf-8") as handle:
-            payload = yaml.safe_load(handle) or {}
-        rules = payload.get("rules", [])
-        defaults = payload.get("defaults", {})
-        return cls(rules=rules, defaults=defaults)
-
-    def route(self, user_input: str) -> RouteDecision:
-        for rule in self._rules:
+    @staticmethod
+    def _compile_rules(rules: List[Dict[str, str]], defaults: Dict[str, object]) -> List[_CompiledRule]:
+        """Resolve flags, params and patterns once so route() only runs searches."""
+        compiled = []
+        for rule in rules:
             if rule.get("enabled", True) is False:
                 continue
 
@@ -46,23 +81,136 @@ class PolicyRouter:
             if not patterns:
                 continue
 
-            case_insensitive = rule.get("case_insensitive", self._defaults.get("case_insensitive", True))
+            case_insensitive = rule.get("case_insensitive", defaults.get("case_insensitive", True))
             flags = re.IGNORECASE if case_insensitive else 0
-            if any(re.search(pattern, user_input, flags=flags) for pattern in patterns):
-                params = dict(self._defaults.get("params", {}) or {})
-                params.update(rule.get("params", {}) or {})
-                return RouteDecision(
+            params = dict(defaults.get("params", {}) or {})
+            params.update(rule.get("params", {}) or {})
+            compiled.append(
+                _CompiledRule(
+                    patterns=tuple(re.compile(pattern, flags) for pattern in patterns),
                     tool=rule.get("tool"),
                     params=params,
-                    confidence=float(rule.get("confidence", self._defaults.get("confidence", 0.7))),
+                    confidence=float(rule.get("confidence", defaults.get("confidence", 0.7))),
                     reason=rule.get("reason", rule.get("id", "policy_match")),
                 )
+            )
+        return compiled
+
+    @staticmethod
+    def _build_hyperscan(compiled: List[_CompiledRule]):
+        """One Hyperscan DFA over every pattern, tagged with its rule index.
+
+        Returns None when hyperscan is missing or any pattern uses syntax it
+        does not support (e.g. backreferences); route() then uses `re` alone.
+        """
+        if hyperscan is None or not compiled:
+            return None
+        expressions, ids, flags = [], [], []
+        for index, rule in enumerate(compiled):
+            for pattern in rule.patterns:
+                expressions.append(pattern.pattern.encode("utf-8"))
+                ids.append(index)
+                flag = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8
+                if pattern.flags & re.IGNORECASE:
+                    flag |= hyperscan.HS_FLAG_CASELESS
+                flags.append(flag)
+        database = hyperscan.Database()
+        try:
+            database.compile(expressions=expressions, ids=ids, elements=len(expressions), flags=flags)
+        except hyperscan.error:
+            return None
+        return database
+
+    def _candidate_rules(self, user_input: str) -> List[int]:
+        # Scratch space is per thread; a Database is safe to share.
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+        hits = set()
+        self._hs_db.scan(
+            user_input.encode("utf-8"),
+            match_event_handler=lambda rule_id, start, end, flags, context: hits.add(rule_id),
+            scratch=scratch,
+        )
+        return sorted(hits)
+
+    @staticmethod
+    def _build_literal_index(compiled: List[_CompiledRule]) -> Optional[_LiteralIndex]:
+        """Aho-Corasick automata over rules whose patterns are all plain substrings.
+
+        Used when Hyperscan is unavailable: one pass over the input finds every
+        literal rule that can match, so only those and the real-regex rules are
+        searched with `re`. Returns None without pyahocorasick or literal rules.
+        """
+        if ahocorasick is None:
+            return None
+        caseless, cased = ahocorasick.Automaton(), ahocorasick.Automaton()
+        regex_rules = []
+        for index, rule in enumerate(compiled):
+            sources = [pattern.pattern for pattern in rule.patterns]
+            if not all(source and source.isascii() and _REGEX_META.isdisjoint(source) for source in sources):
+                regex_rules.append(index)
+                continue
+            for pattern in rule.patterns:
+                if pattern.flags & re.IGNORECASE:
+                    caseless.add_word(pattern.pattern.lower(), index)
+                else:
+                    cased.add_word(pattern.pattern, index)
+        if len(regex_rules) == len(compiled):
+            return None
+        for automaton in (caseless, cased):
+            if len(automaton):
+                automaton.make_automaton()
+        return _LiteralIndex(
+            caseless=caseless if len(caseless) else None,
+            cased=cased if len(cased) else None,
+            regex_rules=tuple(regex_rules),
+        )
+
+    def _literal_candidates(self, user_input: str) -> List[int]:
+        index = self._literal_index
+        hits = set(index.regex_rules)
+        if index.caseless is not None:
+            hits.update(rule_id for _, rule_id in index.caseless.iter(user_input.lower()))
+        if index.cased is not None:
+            hits.update(rule_id for _, rule_id in index.cased.iter(user_input))
+        return sorted(hits)
+
+    @classmethod
+    def from_env(cls) -> "PolicyRouter":
+        policy_path = os.getenv("ORCH_ROUTER_POLICY_PATH", "config/router_policy.yaml")
+        with open(policy_path, "r", encoding="utf-8") as handle:
+            payload = yaml.load(handle, Loader=SafeLoader) or {}
+        rules = payload.get("rules", [])
+        defaults = payload.get("defaults", {})
+        return cls(rules=rules, defaults=defaults)
+
+    def route(self, user_input: str) -> RouteDecision:
+        rules = self._compiled
+        # Hyperscan classes (\b, \w, \s) are ASCII-only, and lower() only agrees
+        # with re.IGNORECASE on ASCII, so both prefilters skip other input;
+        # candidates are confirmed with `re` in policy order.
+        if self._hs_db is not None and user_input.isascii():
+            rules = [self._compiled[index] for index in self._candidate_rules(user_input)]
+        elif self._literal_index is not None and user_input.isascii():
+            rules = [self._compiled[index] for index in self._literal_candidates(user_input)]
+        for rule in rules:
+            if any(pattern.search(user_input) for pattern in rule.patterns):
+                return RouteDecision(
+                    tool=rule.tool,
+                    params=dict(rule.params),
+                    confidence=rule.confidence,
+                    reason=rule.reason,
+                )
         return RouteDecision(tool=None, params={}, confidence=0.0, reason="no_match")
 
 
 class ModelRouter:
     """Model selector with cost-aware defaults and explainable reasons."""
 
+    # One case-insensitive scan instead of lower() + a substring test per keyword.
+    _ANALYSIS_RE = re.compile(r"analyze|strategy|threat model", re.IGNORECASE)
+
     def __init__(self) -> None:
         self.model_chat = os.getenv("ORCH_MODEL_CHAT", "qwen2.5:3b")
         self.model_tool = os.getenv("ORCH_MODEL_TOOL", "qwen2.5:3b")
@@ -83,7 +231,14 @@ class ModelRouter:
         if tool_selected:
             return ModelDecision(model=self.model_tool, reason="tool_selected")
 
-        total_tokens = token_count if token_count is not None else self._count_tokens(messages)
+        if token_count is not None:
+            total_tokens = token_count
+        elif self._token_upper_bound(messages) <= min(
+            self.chat_tier1_max_tokens, self.reasoner_tier1_max_tokens, self.tier3_min_tokens
+        ):
+            total_tokens = 0  # cannot overflow any tier; skip the tokenizer
+        else:
+            total_tokens = self._count_tokens(messages)
 
         if total_tokens > self.tier3_min_tokens:
             return ModelDecision(model=self.model_reasoner, reason="tier3_summary_required")
@@ -91,24 +246,27 @@ class ModelRouter:
             return ModelDecision(model=self.model_reasoner, reason="tier2_overflow")
         if total_tokens > self.chat_tier1_max_tokens:
             return ModelDecision(model=self.model_reasoner, reason="tier1_overflow")
-        if any(
-            keyword in self._last_user_text(messages).lower()
-            for keyword in ("analyze", "strategy", "threat model")
-        ):
+        if self._ANALYSIS_RE.search(self._last_user_text(messages)):
             return ModelDecision(model=self.model_reasoner, reason="analysis_request")
         return ModelDecision(model=self.model_chat, reason="default_chat")
 
+    @staticmethod
+    def _token_upper_bound(messages: List[Dict[str, str]]) -> int:
+        """Cheap ceiling on _count_tokens: byte-level tokens never exceed UTF-8
+        bytes, plus the safety margin the byte fallback tokenizer applies."""
+        return sum(
+            math.ceil(len(str(msg.get("content", "")).encode("utf-8")) * DEFAULT_SAFETY_MARGIN)
+            for msg in messages
+        )
+
     def _count_tokens(self, messages: List[Dict[str, str]]) -> int:
         total = 0
         for msg in messages:
             content = str(msg.get("content", "")).strip()
             if not content:
                 continue
-            payload = orch_tokenizer(action="count", text=content, model_name=self.tokenizer_model)
-            if payload.get("status") == "ok":
-                total += int(payload.get("token_count", 0))
-            else:
-                total += max(1, len(content) // 4)
+            count = count_tokens_cached(content, self.tokenizer_model)
+            total += count if count is not None else max(1, len(content) // 4)
         return total
 
     @staticmethod
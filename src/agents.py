@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
-from src.tools.orch_tokenizer import orch_tokenizer
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
+from src.tools.orch_tokenizer import count_tokens_cached, orch_tokenizer
 from src.tracer import get_tracer, record_semantic_truncation_delta
 
 logger = logging.getLogger("orchestrators_v2.agents")
@@ -24,6 +30,16 @@ class AgentProfile:
     metadata: Dict[str, Any]
 
 
+_AGENT_SUFFIXES = frozenset({".yaml", ".yml"})
+
+# Parsed profiles keyed by file path, reused while the file's mtime is unchanged.
+_PROFILE_CACHE: Dict[Path, Tuple[int, Optional[AgentProfile]]] = {}
+# Sorted YAML listing per agent dir, reused while the directory's mtime is unchanged.
+_LISTING_CACHE: Dict[Path, Tuple[int, List[Path]]] = {}
+# Loaded profiles + lowercase name index per agent dir, keyed by the (path, mtime) signature.
+_AGENTS_CACHE: Dict[Path, Tuple[Tuple[Tuple[Path, int], ...], List[AgentProfile], Dict[str, AgentProfile]]] = {}
+
+
 def _agent_dir() -> Path:
     root = Path(__file__).resolve().parents[1]
     default_dir = root / "config" / "agents"
@@ -32,7 +48,7 @@ def _agent_dir() -> Path:
 
 def _load_agent_file(path: Path) -> Optional[AgentProfile]:
     try:
-        data = yaml.safe_load(path.read_text()) or {}
+        data = yaml.load(path.read_bytes(), Loader=SafeLoader) or {}
     except Exception as exc:  # pragma: no cover - defensive
         logger.warning("Failed to load agent config", extra={"extra": {"path": str(path), "error": str(exc)}})
         return None
@@ -51,23 +67,68 @@ def _load_agent_file(path: Path) -> Optional[AgentProfile]:
     )
 
 
-def list_agents() -> List[Dict[str, Any]]:
+def _agent_paths(agent_dir: Path) -> List[Path]:
+    dir_mtime = agent_dir.stat().st_mtime_ns
+    cached = _LISTING_CACHE.get(agent_dir)
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
+    paths = sorted(
+        (path for path in agent_dir.iterdir() if path.suffix in _AGENT_SUFFIXES),
+        key=lambda path: path.name,
+    )
+    _LISTING_CACHE[agent_dir] = (dir_mtime, paths)
+    return paths
+
+
+def _load_cached(path: Path, mtime: int) -> Optional[AgentProfile]:
+    cached = _PROFILE_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    agent = _load_agent_file(path)
+    _PROFILE_CACHE[path] = (mtime, agent)
+    return agent
+
+
+def _load_agents(agent_dir: Path) -> Tuple[List[AgentProfile], Dict[str, AgentProfile]]:
+    """Return profiles in file order plus a name index; only changed files are re-parsed."""
+    signature = []
+    for path in _agent_paths(agent_dir):
+        try:
+            signature.append((path, path.stat().st_mtime_ns))
+        except OSError:
+            continue
+    key = tuple(signature)
+    cached = _AGENTS_CACHE.get(agent_dir)
+    if cached and cached[0] == key:
+        return cached[1], cached[2]
+
     agents = []
+    by_name: Dict[str, AgentProfile] = {}
+    for path, mtime in key:
+        agent = _load_cached(path, mtime)
+        if not agent:
+            continue
+        agents.append(agent)
+        by_name.setdefault(agent.name.lower(), agent)
+    _AGENTS_CACHE[agent_dir] = (key, agents, by_name)
+    return agents, by_name
+
+
+def list_agents() -> List[Dict[str, Any]]:
     agent_dir = _agent_dir()
     if not agent_dir.exists():
-        return agents
+        return []
 
-    for path in sorted(agent_dir.glob("*.y*ml")):
-        agent = _load_agent_file(path)
-        if not agent:
-            continue
-        agents.append({
+    agents, _ = _load_agents(agent_dir)
+    return [
+        {
             "name": agent.name,
             "description": agent.description,
             "tools": agent.tools,
             "metadata": agent.metadata,
-        })
-    return agents
+        }
+        for agent in agents
+    ]
 
 
 def get_agent(name: str) -> Optional[AgentProfile]:
@@ -75,11 +136,8 @@ def get_agent(name: str) -> Optional[AgentProfile]:
     if not agent_dir.exists():
         return None
 
-    for path in agent_dir.glob("*.y*ml"):
-        agent = _load_agent_file(path)
-        if agent and agent.name.lower() == name.lower():
-            return agent
-    return None
+    _, by_name = _load_agents(agent_dir)
+    return by_name.get(name.lower())
 
 
 def inject_agent_prompt(
@@ -163,30 +221,35 @@ def inject_agent_prompt(
 def _count_tokens(text: str, model_name: str) -> int:
     if not text:
         return 0
-    payload = orch_tokenizer(action="count", text=text, model_name=model_name)
-    if payload.get("status") == "ok":
-        return int(payload.get("token_count", 0))
-    return max(1, len(text) // 4)
+    count = count_tokens_cached(text, model_name)
+    return count if count is not None else max(1, len(text) // 4)
 
 
 def _truncate_to_tokens(text: str, max_tokens: int, model_name: str) -> str:
     if max_tokens <= 0 or not text:
         return ""
+    semantic_text, delta_tokens = _truncate_to_tokens_cached(text, max_tokens, model_name)
+    if delta_tokens is not None:
+        record_semantic_truncation_delta(delta_tokens)
+    return semantic_text
+
+
+@lru_cache(maxsize=64)
+def _truncate_to_tokens_cached(text: str, max_tokens: int, model_name: str) -> Tuple[str, Optional[int]]:
+    """Agent prompts are fixed, so the same truncation repeats on every request."""
     payload = orch_tokenizer(action="encode", text=text, model_name=model_name)
     if payload.get("status") != "ok":
-        return ""
+        return "", None
     tokens = payload.get("tokens", [])
     if len(tokens) <= max_tokens:
-        return text.strip()
+        return text.strip(), None
     truncated = tokens[:max_tokens]
     decoded = orch_tokenizer(action="decode", tokens=truncated, model_name=model_name)
     if decoded.get("status") != "ok":
-        return ""
+        return "", None
     hard_text = str(decoded.get("text", "")).strip()
     semantic_text = _semantic_truncate_text(hard_text, truncated, model_name)
-    delta_tokens = _semantic_truncation_delta(truncated, semantic_text, model_name)
-    record_semantic_truncation_delta(delta_tokens)
-    return semantic_text
+    return semantic_text, _semantic_truncation_delta(truncated, semantic_text, model_name)
 
 
 def _semantic_truncate_text(text: str, tokens: List[int], model_name: str) -> str:
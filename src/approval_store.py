@@ -1,26 +1,70 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import secrets
 import sqlite3
-import uuid
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.fast_json import dumps_bytes
+from src.isotime import utc_iso
 
 DEFAULT_APPROVAL_DB = "instance/tool_approvals.db"
 
+# Hot statements as fixed strings, so each connection's statement cache hits on reuse.
+_SQL_INSERT = """
+    INSERT INTO tool_approvals (
+        approval_id, tool_name, args_hash, created_at, expires_at, status, metadata_json,
+        expires_at_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_UPDATE = "UPDATE tool_approvals SET status = ?, consumed_at = ? WHERE approval_id = ?"
+
+# ISO-8601 expires_at -> epoch milliseconds, for rows written before expires_at_ms.
+_ISO_TO_MS = "CAST(round((julianday({}) - 2440587.5) * 86400000) AS INTEGER)"
+
+# Rows written without expires_at_ms fall back to the ISO text; if that does not
+# parse either, the approval counts as expired (fail closed).
+_EXPIRY_MS = f"COALESCE(expires_at_ms, {_ISO_TO_MS.format('expires_at')}, 0)"
+
+# Columns in ToolApproval field order, so a row unpacks positionally.
+_SQL_SELECT = f"""
+    SELECT approval_id, tool_name, args_hash, created_at, expires_at, consumed_at, status,
+        {_EXPIRY_MS} <= ?
+    FROM tool_approvals WHERE approval_id = ?
+"""
+# The indexed compare covers normal rows; the NULL branch catches unmigrated ones.
+_SQL_PURGE = f"""
+    DELETE FROM tool_approvals
+    WHERE status = 'pending'
+        AND (expires_at_ms < ? OR (expires_at_ms IS NULL AND {_EXPIRY_MS} < ?))
+"""
+
 
 def hash_tool_args(args: Dict[str, Any]) -> str:
-    payload = json.dumps(args or {}, sort_keys=True, separators=(",", ":"), default=str)
-    return _sha256(payload)
+    if not args:
+        return _EMPTY_ARGS_HASH
+    return _sha256(_canonical_args(args))
+
+
+def _canonical_args(args: Dict[str, Any]) -> bytes:
+    # Always stdlib json: the hash must not depend on whether orjson is installed
+    # (it differs on non-ASCII, float and datetime formatting).
+    return json.dumps(args, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
 
 
-def _sha256(payload: str) -> str:
-    import hashlib
+def _sha256(payload: bytes) -> str:
+    # Binds an approval to its args; not a password or signature digest.
+    return hashlib.sha256(payload, usedforsecurity=False).hexdigest()
 
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# Many tools take no parameters; their hash never changes.
+_EMPTY_ARGS_HASH = _sha256(_canonical_args({}))
 
 
 @dataclass(frozen=True)
@@ -39,25 +83,70 @@ class ToolApprovalStore:
         self.db_path = db_path or os.getenv("ORCH_TOOL_APPROVAL_DB_PATH", DEFAULT_APPROVAL_DB)
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
         self._init_db()
 
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened once in autocommit mode."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            if os.getenv("ORCH_SQLITE_WAL_ENABLED", "1") == "1":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS tool_approvals (
-                    approval_id TEXT PRIMARY KEY,
-                    tool_name TEXT NOT NULL,
-                    args_hash TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    expires_at TEXT NOT NULL,
-                    consumed_at TEXT,
-                    status TEXT NOT NULL,
-                    metadata_json TEXT
-                )
-                """
+        conn = self._conn()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tool_approvals (
+                approval_id TEXT PRIMARY KEY,
+                tool_name TEXT NOT NULL,
+                args_hash TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL,
+                consumed_at TEXT,
+                status TEXT NOT NULL,
+                metadata_json BLOB,
+                expires_at_ms INTEGER
             )
-            conn.commit()
+            """
+        )
+        self._migrate_expires_at_ms(conn)
+
+    @staticmethod
+    def _migrate_expires_at_ms(conn: sqlite3.Connection) -> None:
+        """Integer expiry next to the ISO text: int compares and an index for sweeps."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(tool_approvals)")}
+        if "expires_at_ms" not in columns:
+            conn.execute("ALTER TABLE tool_approvals ADD COLUMN expires_at_ms INTEGER")
+        conn.execute(
+            f"UPDATE tool_approvals SET expires_at_ms = {_ISO_TO_MS.format('expires_at')} "
+            "WHERE expires_at_ms IS NULL"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tool_approvals_expires ON tool_approvals(expires_at_ms)"
+        )
+        # Keep the two in step when expires_at is edited directly.
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_tool_approvals_expires_at_ms
+            AFTER UPDATE OF expires_at ON tool_approvals BEGIN
+                UPDATE tool_approvals SET expires_at_ms = {_ISO_TO_MS.format('NEW.expires_at')}
+                WHERE approval_id = NEW.approval_id;
+            END
+            """
+        )
 
     def issue(
         self,
@@ -66,34 +155,47 @@ class ToolApprovalStore:
         ttl_seconds: Optional[int] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> ToolApproval:
-        ttl_seconds = ttl_seconds or int(os.getenv("ORCH_TOOL_APPROVAL_TTL_SEC", "900"))
-        now = datetime.now(timezone.utc)
-        created_at = now.isoformat()
-        expires_at = (now + timedelta(seconds=ttl_seconds)).isoformat()
-        approval_id = str(uuid.uuid4())
-        args_hash = hash_tool_args(args)
-        payload = json.dumps(metadata or {}, separators=(",", ":"))
-
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO tool_approvals (
-                    approval_id, tool_name, args_hash, created_at, expires_at, status, metadata_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (approval_id, tool_name, args_hash, created_at, expires_at, "pending", payload),
+        return self.issue_many([(tool_name, args, ttl_seconds, metadata)])[0]
+
+    def issue_many(
+        self,
+        items: List[Tuple[str, Dict[str, Any], Optional[int], Optional[Dict[str, Any]]]],
+    ) -> List[ToolApproval]:
+        """Issue one approval per (tool_name, args, ttl_seconds, metadata) in one transaction."""
+        default_ttl = int(os.getenv("ORCH_TOOL_APPROVAL_TTL_SEC", "900"))
+        now_ns = time.time_ns()
+        created_at = utc_iso(now_ns)
+        approvals = []
+        rows = []
+        for tool_name, args, ttl_seconds, metadata in items:
+            expires_ns = now_ns + int((ttl_seconds or default_ttl) * 1_000_000_000)
+            approval = ToolApproval(
+                approval_id=secrets.token_hex(16),
+                tool_name=tool_name,
+                args_hash=hash_tool_args(args),
+                created_at=created_at,
+                expires_at=utc_iso(expires_ns),
+                consumed_at=None,
+                status="pending",
+            )
+            approvals.append(approval)
+            rows.append(
+                (
+                    approval.approval_id, tool_name, approval.args_hash, created_at,
+                    approval.expires_at, "pending", dumps_bytes(metadata or {}),
+                    expires_ns // 1_000_000,
+                )
             )
-            conn.commit()
-
-        return ToolApproval(
-            approval_id=approval_id,
-            tool_name=tool_name,
-            args_hash=args_hash,
-            created_at=created_at,
-            expires_at=expires_at,
-            consumed_at=None,
-            status="pending",
-        )
+
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(_SQL_INSERT, rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return approvals
 
     def validate_and_consume(
         self,
@@ -104,66 +206,49 @@ class ToolApprovalStore:
         if not approval_id:
             return False, "missing_approval", None
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
-                """
-                SELECT * FROM tool_approvals WHERE approval_id = ?
-                """,
-                (approval_id,),
-            ).fetchone()
+        conn = self._conn()
+        # IMMEDIATE takes the write lock up front, so two callers cannot both
+        # see the row as pending and consume it.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(_SQL_SELECT, (time.time_ns() // 1_000_000, approval_id)).fetchone()
 
             if not row:
                 return False, "unknown_approval", None
 
-            status = row["status"]
+            (_, row_tool, row_hash, created_at, expires_at, consumed_at, status, expired) = row
             if status != "pending":
-                return False, "already_consumed", self._row_to_approval(row)
-
-            if row["tool_name"] != tool_name:
-                return False, "tool_mismatch", self._row_to_approval(row)
-
-            if row["args_hash"] != args_hash:
-                return False, "args_hash_mismatch", self._row_to_approval(row)
-
-            expires_at = datetime.fromisoformat(row["expires_at"])
-            now = datetime.now(timezone.utc)
-            if expires_at <= now:
-                return False, "expired", self._row_to_approval(row)
-
-            consumed_at = now.isoformat()
-            conn.execute(
-                """
-                UPDATE tool_approvals
-                SET status = ?, consumed_at = ?
-                WHERE approval_id = ?
-                """,
-                ("consumed", consumed_at, approval_id),
-            )
-            conn.commit()
+                return False, "already_consumed", ToolApproval(*row[:7])
 
-            approval = ToolApproval(
-                approval_id=approval_id,
-                tool_name=tool_name,
-                args_hash=args_hash,
-                created_at=row["created_at"],
-                expires_at=row["expires_at"],
-                consumed_at=consumed_at,
-                status="consumed",
-            )
-            return True, "approved", approval
+            if row_tool != tool_name:
+                return False, "tool_mismatch", ToolApproval(*row[:7])
 
-    @staticmethod
-    def _row_to_approval(row: sqlite3.Row) -> ToolApproval:
-        return ToolApproval(
-            approval_id=row["approval_id"],
-            tool_name=row["tool_name"],
-            args_hash=row["args_hash"],
-            created_at=row["created_at"],
-            expires_at=row["expires_at"],
-            consumed_at=row["consumed_at"],
-            status=row["status"],
-        )
+            if row_hash != args_hash:
+                return False, "args_hash_mismatch", ToolApproval(*row[:7])
+
+            if expired:
+                return False, "expired", ToolApproval(*row[:7])
+
+            consumed_at = utc_iso()
+            conn.execute(_SQL_UPDATE, ("consumed", consumed_at, approval_id))
+            conn.execute("COMMIT")
+        finally:
+            # Rejections return (and errors raise) with nothing to write.
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+        approval = ToolApproval(approval_id, tool_name, args_hash, created_at, expires_at, consumed_at, "consumed")
+        return True, "approved", approval
+
+    def purge_expired(self, before_ms: Optional[int] = None) -> int:
+        """Delete pending approvals that expired before `before_ms` (default: now).
+
+        Consumed rows are kept as the audit record. Returns the number deleted.
+        """
+        if before_ms is None:
+            before_ms = time.time_ns() // 1_000_000
+        cursor = self._conn().execute(_SQL_PURGE, (before_ms, before_ms))
+        return cursor.rowcount
 
 
 def approval_enforced() -> bool:
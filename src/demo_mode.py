@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 import os
+import re
 from typing import Optional
 
+_INTENT_RE = re.compile(r"calc|echo", re.IGNORECASE)
+_CALC_RE = re.compile(r"calc", re.IGNORECASE)
+
 
 def _heuristic_intent(text: str) -> str:
-    lowered = (text or "").lower()
-    if "calc" in lowered:
-        return "safe_calc"
-    if "echo" in lowered:
+    text = text or ""
+    match = _INTENT_RE.search(text)
+    if match:
+        # "calc" wins over "echo" wherever it appears; only the tail is left to check.
+        if match.group().lower() == "calc" or _CALC_RE.search(text, match.end()):
+            return "safe_calc"
         return "echo"
-    if lowered.strip():
+    if text.strip():
         return "chat"
     return "unknown"
 
@@ -0,0 +1,51 @@
+"""JSON helpers: orjson when installed, stdlib otherwise."""
+from __future__ import annotations
+
+import json
+from dataclasses import fields
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; stdlib handles them
+    return json.dumps(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Compact UTF-8 JSON, for binding straight into BLOB columns."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def dumps_indented(obj: Any) -> bytes:
+    """Two-space indented UTF-8 JSON, ready to write to disk."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def as_dict(obj: Any) -> Dict[str, Any]:
+    """Shallow field dict of a dataclass instance; slotted ones have no __dict__."""
+    return {field.name: getattr(obj, field.name) for field in fields(obj)}
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-import json
 import os
+import secrets
 import sqlite3
-import uuid
+import threading
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from src.fast_json import dumps_bytes
+from src.isotime import utc_iso
 
 DEFAULT_HITL_DB = "instance/hitl_queue.db"
 
@@ -27,34 +28,49 @@ class HitlQueue:
         self.db_path = db_path or os.getenv("ORCH_INTENT_HITL_DB_PATH", DEFAULT_HITL_DB)
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
         self._init_db()
 
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened once in autocommit mode."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            if os.getenv("ORCH_SQLITE_WAL_ENABLED", "1") == "1":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS hitl_queue (
-                    request_id TEXT PRIMARY KEY,
-                    created_at TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    payload_json TEXT NOT NULL
-                )
-                """
+        self._conn().execute(
+            """
+            CREATE TABLE IF NOT EXISTS hitl_queue (
+                request_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload_json BLOB NOT NULL
             )
-            conn.commit()
+            """
+        )
 
     def enqueue(self, payload: Dict[str, Any]) -> Optional[HitlRequest]:
         if not self.enabled:
             return None
-        request_id = str(uuid.uuid4())
-        created_at = datetime.now(timezone.utc).isoformat()
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO hitl_queue (request_id, created_at, status, payload_json)
-                VALUES (?, ?, ?, ?)
-                """,
-                (request_id, created_at, "pending", json.dumps(payload, separators=(",", ":"))),
-            )
-            conn.commit()
+        request_id = secrets.token_hex(16)
+        created_at = utc_iso()
+        self._conn().execute(
+            """
+            INSERT INTO hitl_queue (request_id, created_at, status, payload_json)
+            VALUES (?, ?, ?, ?)
+            """,
+            (request_id, created_at, "pending", dumps_bytes(payload)),
+        )
         return HitlRequest(request_id=request_id, created_at=created_at, status="pending", payload=payload)
\ No newline at end of file
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import contextvars
 import hashlib
+import hmac
 import os
-from typing import Tuple, Any, Dict, List
-
-from flask import Blueprint, Response, current_app, g, jsonify, request
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from functools import wraps
+from typing import Tuple, Any, Callable, Dict, Iterator, List, Optional
+
+from flask import Blueprint, Response, g, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
 from src.agents import get_agent, inject_agent_prompt, list_agents
 from src.llm_provider import get_provider
 from src.orchestrator_memory import evaluate_memory_capture
@@ -14,6 +26,7 @@ from src.demo_mode import build_demo_response
 from src.tracer import get_tracer
 from src.policy_engine import load_policy_snapshot
 from src.approval_store import ToolApprovalStore
+from src.fast_json import as_dict, dumps
 from src.trust_panel import (
     trust_panel_enabled,
     list_trust_events,
@@ -22,37 +35,239 @@ from src.trust_panel import (
 )
 
 
+@dataclass(frozen=True)
+class RouteConfig:
+    """Environment settings the routes read, snapshotted once per app."""
+
+    api_enabled: bool
+    auth_required: bool
+    bearer_token: str
+    orch_mode: str
+    llm_enabled: bool
+    llm_timeout_sec: int
+    llm_network_enabled: bool
+    metrics_enabled: bool
+    intent_expose: bool
+    fast_json: bool
+    memory_capture_timeout_sec: float
+
+    @classmethod
+    def from_env(cls) -> "RouteConfig":
+        production = os.getenv("ORCH_ENV", "development").lower() == "production"
+        return cls(
+            api_enabled=os.getenv("ORCH_ENABLE_API", "1") == "1",
+            auth_required=production or os.getenv("ORCH_REQUIRE_BEARER", "1") == "1",
+            bearer_token=os.getenv("ORCH_BEARER_TOKEN", ""),
+            orch_mode=os.getenv("ORCH_ORCHESTRATOR_MODE", "basic"),
+            llm_enabled=os.getenv("ORCH_LLM_ENABLED", "0") == "1",
+            llm_timeout_sec=int(os.getenv("ORCH_LLM_TIMEOUT_SEC", "30")),
+            llm_network_enabled=os.getenv("ORCH_LLM_NETWORK_ENABLED", "0") == "1",
+            metrics_enabled=os.getenv("ORCH_METRICS_ENABLED", "1") == "1",
+            intent_expose=os.getenv("ORCH_INTENT_DECISION_EXPOSE", "0") == "1",
+            fast_json=os.getenv("ORCH_FAST_JSON", "1") == "1",
+            memory_capture_timeout_sec=float(os.getenv("ORCH_MEMORY_CAPTURE_TIMEOUT_SEC", "2")),
+        )
+
+
+def _error_body(message: str, error_type: str, code: int) -> Tuple[bytes, int]:
+    return dumps({"error": {"message": message, "type": error_type, "code": code}}).encode("utf-8"), code
+
+
+# Error envelopes serialized once at import; each request gets a fresh Response
+# around the shared bytes (after_request handlers mutate response headers).
+_ERR_API_DISABLED = _error_body("API disabled", "service_unavailable", 503)
+_ERR_TRUST_DISABLED = _error_body("Trust panel disabled", "service_unavailable", 503)
+_ERR_UNAUTHORIZED = _error_body("Unauthorized", "auth_error", 401)
+_ERR_TRACE_ID_REQUIRED = _error_body("trace_id required", "invalid_request", 400)
+_ERR_TOOL_NAME_REQUIRED = _error_body("Tool name required", "validation_error", 400)
+_ERR_AGENT_NOT_FOUND = _error_body("Agent not found", "not_found", 404)
+_ERR_MESSAGES_REQUIRED = _error_body("Messages required", "invalid_request", 400)
+
+
+def _error_response(error: Tuple[bytes, int]) -> Response:
+    body, status = error
+    return Response(body, status=status, mimetype="application/json")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson.
+
+    Dates still go through Flask's default hook (HTTP date format). Parsing stays
+    on the stdlib loads, which keeps integers wider than 64 bits exact and accepts
+    NaN/Infinity.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        except TypeError:  # e.g. integers wider than 64 bits
+            return super().dumps(obj, **kwargs)
+
+
+def ojsonify(obj: Any) -> Response:
+    """jsonify() equivalent that encodes with orjson straight to bytes."""
+    try:
+        body = orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:  # e.g. integers wider than 64 bits
+        return jsonify(obj)
+    return Response(body, mimetype="application/json")
+
+
+def _last_user(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message
+    return {}
+
+
+# One slot per request thread (gunicorn.conf.py `threads`); beyond that, capture runs inline.
+_MEMORY_CAPTURE_THREADS = max(int(os.getenv("ORCH_MEMORY_CAPTURE_THREADS", "2")), 1)
+_MEMORY_POOL = ThreadPoolExecutor(max_workers=_MEMORY_CAPTURE_THREADS, thread_name_prefix="orch-memory")
+_MEMORY_SLOTS = threading.BoundedSemaphore(_MEMORY_CAPTURE_THREADS)
+
+
+def _start_memory_capture(messages: List[Dict[str, Any]], trace_id: Optional[str]) -> Future:
+    """Run memory capture off the request thread while the orchestrator answers.
+
+    Request headers are read here, in the request context; the worker only sees plain values
+    and runs in a copy of the caller's contextvars. When every pool slot is busy the capture
+    runs inline instead of queueing behind other requests.
+    """
+    kwargs = {
+        "user_message": _last_user(messages).get("content", ""),
+        "conversation_id": request.headers.get("X-Conversation-ID"),
+        "user_id_hash": _user_id_hash(),
+        "trace_id": trace_id,
+    }
+    if not _MEMORY_SLOTS.acquire(blocking=False):
+        future: Future = Future()
+        try:
+            future.set_result(evaluate_memory_capture(**kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+    future = _MEMORY_POOL.submit(contextvars.copy_context().run, evaluate_memory_capture, **kwargs)
+    future.add_done_callback(lambda _: _MEMORY_SLOTS.release())
+    return future
+
+
+def _memory_decision(future: Future, timeout_sec: float) -> Dict[str, Any]:
+    """The capture's decision, or a pending marker if it is still running at the timeout.
+
+    A late capture still finishes and records its own trace step; only the response stops waiting.
+    """
+    try:
+        return future.result(timeout=timeout_sec)
+    except FutureTimeoutError:
+        return {"decision": "pending", "reason": "pending:capture_timeout", "candidate_id": None}
+
+
+def _sse_chunks(completion: Dict[str, Any], encode: Callable[[Any], str]) -> Iterator[str]:
+    """OpenAI-style chat.completion.chunk events for an already complete answer.
+
+    The orchestrator returns whole messages, so this is one delta carrying the
+    message, then a closing chunk with finish_reason and the orchestrator metadata.
+    """
+    choice = completion["choices"][0]
+    base = {"id": completion["id"], "object": "chat.completion.chunk"}
+    yield f"data: {encode({**base, 'choices': [{'index': 0, 'delta': choice['message'], 'finish_reason': None}]})}\n\n"
+    extras = {key: value for key, value in completion.items() if key not in ("id", "object", "choices")}
+    closing = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": choice["finish_reason"]}], **extras}
+    yield f"data: {encode(closing)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def _semantic_step(candidates: List[Any], route_decision: Any) -> Dict[str, Any]:
+    """Trace payload for the semantic router step; one shape for every route."""
+    return {
+        "candidates": [{"tool": candidate.tool, "score": candidate.score} for candidate in candidates],
+        "decision": as_dict(route_decision) if route_decision else None,
+    }
+
+
+def _user_id_hash() -> str:
+    """Short pseudonymous id for this request's Authorization header.
+
+    Memoized on `g`, so nothing derived from the credential outlives the request.
+    """
+    cached = g.get("user_id_hash")
+    if cached is None:
+        auth_header = request.headers.get("Authorization", "")
+        cached = (
+            hashlib.sha256(auth_header.encode(), usedforsecurity=False).hexdigest()[:16]
+            if auth_header
+            else "anonymous"
+        )
+        g.user_id_hash = cached
+    return cached
+
+
 def register_routes(app) -> Blueprint:
     limiter = app.config.get("ORCH_LIMITER")
     rate_limit = app.config.get("ORCH_RATE_LIMIT")
+    # Env is read once here; restart (or re-create the app) to pick up changes.
+    cfg = app.config.setdefault("ORCH_ROUTE_CONFIG", RouteConfig.from_env())
+    # Full expected header, built once; empty means no token is configured.
+    expected_auth = f"Bearer {cfg.bearer_token}".encode() if cfg.bearer_token else b""
+    if cfg.fast_json and orjson is not None:
+        # Covers jsonify() on every path.
+        app.json = OrjsonProvider(app)
+        json_response = ojsonify
+    else:
+        json_response = jsonify
+    # One store per app: its schema bootstrap runs once, and each worker thread
+    # keeps its SQLite connection open across requests.
+    if "ORCH_TOOL_APPROVALS" not in app.config:
+        app.config["ORCH_TOOL_APPROVALS"] = ToolApprovalStore()
+    # App-scoped singletons, bound once so the views read closure cells
+    # instead of doing config lookups per request.
+    approvals = app.config["ORCH_TOOL_APPROVALS"]
+    orchestrator = app.config["ORCH_ORCHESTRATOR"]
+    tracer = get_tracer()
+    metrics_registry = app.config.get("ORCH_METRICS_REGISTRY")
 
     def _limit_route(func):
         if limiter:
             return limiter.limit(rate_limit)(func)
         return func
 
-    def _api_enabled() -> bool:
-        return os.getenv("ORCH_ENABLE_API", "1") == "1"
-
     def _auth_required() -> bool:
-        if os.getenv("ORCH_ENV", "development").lower() == "production":
-            return True
-        return os.getenv("ORCH_REQUIRE_BEARER", "1") == "1"
+        return cfg.auth_required
 
-    def require_bearer() -> Tuple[bool, Dict[str, Any] | None]:
+    def require_bearer() -> bool:
         if not _auth_required():
-            return True, None
-        token = os.getenv("ORCH_BEARER_TOKEN", "")
-        got = request.headers.get("Authorization", "")
-        if not token or got != f"Bearer {token}":
-            return False, {"error": {"message": "Unauthorized", "type": "auth_error", "code": 401}}
-        return True, None
+            return True
+        got = request.headers.get("Authorization", "").encode()
+        return bool(expected_auth) and hmac.compare_digest(got, expected_auth)
+
+    def _guarded(is_enabled, disabled: Tuple[bytes, int]):
+        """Reject disabled features, then bad bearer tokens, before the view runs."""
+        def decorate(func):
+            @wraps(func)
+            def inner(*args, **kwargs):
+                if not is_enabled():
+                    return _error_response(disabled)
+                if not require_bearer():
+                    return _error_response(_ERR_UNAUTHORIZED)
+                return func(*args, **kwargs)
+            return inner
+        return decorate
+
+    api_guard = _guarded(lambda: cfg.api_enabled, _ERR_API_DISABLED)
+    trust_guard = _guarded(lambda: cfg.api_enabled and trust_panel_enabled(), _ERR_TRUST_DISABLED)
+
+    def _chat_response(completion: Dict[str, Any], stream: bool) -> Response:
+        if not stream:
+            return json_response(completion)
+        return Response(_sse_chunks(completion, app.json.dumps), mimetype="text/event-stream")
 
     def _resolve_orchestrator_response(messages: List[Dict[str, str]], trace_id: str | None):
-        orchestrator = current_app.config["ORCH_ORCHESTRATOR"]
-        orch_mode = os.getenv("ORCH_ORCHESTRATOR_MODE", "basic")
-
-        if orch_mode == "advanced":
+        if cfg.orch_mode == "advanced":
             result = orchestrator.handle(messages, trace_id=trace_id)
             assistant_content = result["assistant_content"]
             model_decision = result.get("model_decision")
@@ -61,7 +276,7 @@ def register_routes(app) -> Blueprint:
             intent_decision = result.get("intent_decision")
             semantic_candidates = result.get("semantic_candidates") or []
         else:
-            use_llm = os.getenv("ORCH_LLM_ENABLED", "0") == "1"
+            use_llm = cfg.llm_enabled
             model_decision = None
             tool_result = None
             route_decision = None
@@ -72,7 +287,6 @@ def register_routes(app) -> Blueprint:
                 llm_response = provider.generate(messages)
                 assistant_content = llm_response.content
                 if trace_id:
-                    tracer = get_tracer()
                     tracer.record_step(
                         trace_id,
                         "llm_provider",
@@ -83,12 +297,12 @@ def register_routes(app) -> Blueprint:
                             "output_chars": len(llm_response.content),
                             "attempts": llm_response.attempts,
                             "truncated": llm_response.truncated,
-                            "timeout_sec": int(os.getenv("ORCH_LLM_TIMEOUT_SEC", "30")),
-                            "network_enabled": os.getenv("ORCH_LLM_NETWORK_ENABLED", "0") == "1",
+                            "timeout_sec": cfg.llm_timeout_sec,
+                            "network_enabled": cfg.llm_network_enabled,
                         },
                     )
             else:
-                last = next((m for m in reversed(messages) if m.get("role") == "user"), {})
+                last = _last_user(messages)
                 content = last.get("content", "")
                 assistant_content = build_demo_response(content)
 
@@ -100,10 +314,10 @@ def register_routes(app) -> Blueprint:
 
     @app.get("/ready")
     def ready():
-        if not _api_enabled():
+        if not cfg.api_enabled:
             return {"status": "disabled", "service": "orchestrators_v2"}, 503
 
-        if os.getenv("ORCH_LLM_ENABLED", "0") == "1":
+        if cfg.llm_enabled:
             provider = get_provider()
             ok, reason = provider.health_check()
             if not ok:
@@ -117,37 +331,28 @@ def register_routes(app) -> Blueprint:
 
     @app.get("/metrics")
     def metrics():
-        if os.getenv("ORCH_METRICS_ENABLED", "1") != "1":
+        if not cfg.metrics_enabled:
             return {"status": "disabled", "service": "orchestrators_v2"}, 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-        registry = current_app.config["ORCH_METRICS_REGISTRY"]
-        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+        if not require_bearer():
+            return _error_response(_ERR_UNAUTHORIZED)
+        return Response(generate_latest(metrics_registry), mimetype=CONTENT_TYPE_LATEST)
 
     @app.post("/echo")
     def echo():
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
+        if not require_bearer():
+            return _error_response(_ERR_UNAUTHORIZED)
         data = request.get_json(force=True, silent=True) or {}
         message = data.get("message", "")
-        return jsonify({"echo": message}), 200
+        return json_response({"echo": message}), 200
 
     @app.post("/v1/audit/verify")
+    @api_guard
     def audit_verify():
-        if not _api_enabled():
-            return jsonify({"error": {"message": "API disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         payload = request.get_json(force=True, silent=True) or {}
         trace_id = payload.get("trace_id")
         if not trace_id:
-            return jsonify({"error": {"message": "trace_id required", "type": "invalid_request", "code": 400}}), 400
+            return _error_response(_ERR_TRACE_ID_REQUIRED)
 
-        tracer = get_tracer()
         steps = tracer.get_trace_steps(trace_id)
         policy_snapshot = load_policy_snapshot()
 
@@ -160,7 +365,7 @@ def register_routes(app) -> Blueprint:
                 policy_steps.append(step)
 
         valid = bool(policy_hash_trace and policy_hash_current and policy_hash_trace == policy_hash_current)
-        return jsonify({
+        return json_response({
             "trace_id": trace_id,
             "valid": valid,
             "policy_hash_current": policy_hash_current,
@@ -172,13 +377,8 @@ def register_routes(app) -> Blueprint:
 
     @app.get("/v1/trust/events")
     @_limit_route
+    @trust_guard
     def trust_events():
-        if not _api_enabled() or not trust_panel_enabled():
-            return jsonify({"error": {"message": "Trust panel disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         limit = request.args.get("limit")
         step_type = request.args.get("step_type")
         trace_id = request.args.get("trace_id")
@@ -192,99 +392,60 @@ def register_routes(app) -> Blueprint:
             trace_id=trace_id,
             debug=debug,
         )
-        return jsonify(result), 200
+        return json_response(result), 200
 
     @app.get("/v1/trust/trace/<trace_id>")
     @_limit_route
+    @trust_guard
     def trust_trace(trace_id: str):
-        if not _api_enabled() or not trust_panel_enabled():
-            return jsonify({"error": {"message": "Trust panel disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         debug = request.args.get("debug") == "1"
         report = get_trace_report(trace_id, debug=debug)
         if "error" in report:
-            return jsonify({"error": {"message": report["error"], "type": "validation_error", "code": 400}}), 400
-        return jsonify(report), 200
+            return json_response({"error": {"message": report["error"], "type": "validation_error", "code": 400}}), 400
+        return json_response(report), 200
 
     @app.get("/v1/trust/verify/<trace_id>")
     @_limit_route
+    @trust_guard
     def trust_verify(trace_id: str):
-        if not _api_enabled() or not trust_panel_enabled():
-            return jsonify({"error": {"message": "Trust panel disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         expected_hash = request.args.get("expected_hash")
         result = verify_trace_chain(trace_id, expected_hash=expected_hash)
         if "error" in result:
-            return jsonify({"error": {"message": result["error"], "type": "validation_error", "code": 400}}), 400
-        return jsonify(result), 200
+            return json_response({"error": {"message": result["error"], "type": "validation_error", "code": 400}}), 400
+        return json_response(result), 200
 
     @app.post("/v1/chat/completions")
     @_limit_route
+    @api_guard
     def chat_completions():
-        if not _api_enabled():
-            return jsonify({"error": {"message": "API disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         payload = request.get_json(force=True, silent=False) or {}
-        tracer = get_tracer()
+        stream = bool(payload.get("stream", False))
         trace_handle = tracer.start_trace({
             "route": "/v1/chat/completions",
-            "stream": bool(payload.get("stream", False)),
+            "stream": stream,
             "request_id": getattr(g, "request_id", None),
         })
         trace_id = trace_handle.trace_id if trace_handle else None
 
         messages = payload.get("messages", [])
-        last = next((m for m in reversed(messages) if m.get("role") == "user"), {})
-        content = last.get("content", "")
-        auth_header = request.headers.get("Authorization", "")
-        user_id_hash = (
-            hashlib.sha256(auth_header.encode()).hexdigest()[:16]
-            if auth_header
-            else "anonymous"
-        )
-        conversation_id = request.headers.get("X-Conversation-ID")
-        memory_decision = evaluate_memory_capture(
-            user_message=content,
-            conversation_id=conversation_id,
-            user_id_hash=user_id_hash,
-            trace_id=trace_id,
-        )
+        memory_future = _start_memory_capture(messages, trace_id)
 
         try:
             assistant_content, route_decision, intent_decision, model_decision, tool_result, semantic_candidates = _resolve_orchestrator_response(messages, trace_id)
         except Exception as exc:
-            return jsonify({
+            return json_response({
                 "error": {
                     "message": f"LLM provider error: {exc}",
                     "type": "provider_error",
                     "code": 502,
                 },
-                "memory_decision": memory_decision,
+                "memory_decision": _memory_decision(memory_future, cfg.memory_capture_timeout_sec),
             }), 502
 
         if trace_id and semantic_candidates:
-            tracer.record_step(
-                trace_id,
-                "semantic_router",
-                {
-                    "candidates": [
-                        {"tool": candidate.tool, "score": candidate.score}
-                        for candidate in semantic_candidates
-                    ],
-                    "decision": route_decision.__dict__ if route_decision else None,
-                },
-            )
+            tracer.record_step(trace_id, "semantic_router", _semantic_step(semantic_candidates, route_decision))
 
-        expose_intent = os.getenv("ORCH_INTENT_DECISION_EXPOSE", "0") == "1" or request.args.get("debug") == "1"
+        expose_intent = cfg.intent_expose or request.args.get("debug") == "1"
 
         response_payload = {
             "id": "orch_v2_stub",
@@ -295,39 +456,29 @@ def register_routes(app) -> Blueprint:
                 "finish_reason": "stop"
             }],
             "request_id": trace_id or getattr(g, "request_id", None),
-            "memory_decision": memory_decision,
-            "route_decision": route_decision.__dict__ if route_decision else None,
-            "model_decision": model_decision.__dict__ if model_decision else None,
+            "memory_decision": _memory_decision(memory_future, cfg.memory_capture_timeout_sec),
+            "route_decision": route_decision,
+            "model_decision": model_decision,
             "tool_result": tool_result,
         }
         if expose_intent:
-            response_payload["intent_decision"] = intent_decision.__dict__ if intent_decision else None
-        return jsonify(response_payload)
+            response_payload["intent_decision"] = intent_decision
+        return _chat_response(response_payload, stream)
 
     @app.get("/v1/agents")
+    @api_guard
     def agents_list():
-        if not _api_enabled():
-            return jsonify({"error": {"message": "API disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         agents = list_agents()
-        return jsonify({"count": len(agents), "agents": agents}), 200
+        return json_response({"count": len(agents), "agents": agents}), 200
 
     @app.get("/v1/agents/<name>")
+    @api_guard
     def agents_get(name: str):
-        if not _api_enabled():
-            return jsonify({"error": {"message": "API disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         agent = get_agent(name)
         if not agent:
-            return jsonify({"error": {"message": "Agent not found", "type": "not_found", "code": 404}}), 404
+            return _error_response(_ERR_AGENT_NOT_FOUND)
 
-        return jsonify({
+        return json_response({
             "name": agent.name,
             "description": agent.description,
             "system_prompt": agent.system_prompt,
@@ -337,74 +488,45 @@ def register_routes(app) -> Blueprint:
 
     @app.post("/v1/agents/<name>/chat")
     @_limit_route
+    @api_guard
     def agents_chat(name: str):
-        if not _api_enabled():
-            return jsonify({"error": {"message": "API disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         agent = get_agent(name)
         if not agent:
-            return jsonify({"error": {"message": "Agent not found", "type": "not_found", "code": 404}}), 404
+            return _error_response(_ERR_AGENT_NOT_FOUND)
 
         payload = request.get_json(force=True, silent=False) or {}
         messages = payload.get("messages", [])
         if not messages:
-            return jsonify({"error": {"message": "Messages required", "type": "invalid_request", "code": 400}}), 400
+            return _error_response(_ERR_MESSAGES_REQUIRED)
 
-        tracer = get_tracer()
+        stream = bool(payload.get("stream", False))
         trace_handle = tracer.start_trace({
             "route": f"/v1/agents/{name}/chat",
             "agent": agent.name,
-            "stream": False,
+            "stream": stream,
             "request_id": getattr(g, "request_id", None),
         })
         trace_id = trace_handle.trace_id if trace_handle else None
 
-        last = next((m for m in reversed(messages) if m.get("role") == "user"), {})
-        content = last.get("content", "")
-        auth_header = request.headers.get("Authorization", "")
-        user_id_hash = (
-            hashlib.sha256(auth_header.encode()).hexdigest()[:16]
-            if auth_header
-            else "anonymous"
-        )
-        conversation_id = request.headers.get("X-Conversation-ID")
-        memory_decision = evaluate_memory_capture(
-            user_message=content,
-            conversation_id=conversation_id,
-            user_id_hash=user_id_hash,
-            trace_id=trace_id,
-        )
+        memory_future = _start_memory_capture(messages, trace_id)
 
         agent_messages = inject_agent_prompt(messages, agent, trace_id=trace_id)
         try:
-            assistant_content, route_decision, model_decision, tool_result, semantic_candidates = _resolve_orchestrator_response(agent_messages)
+            assistant_content, route_decision, _, model_decision, tool_result, semantic_candidates = _resolve_orchestrator_response(agent_messages, trace_id)
         except Exception as exc:
-            return jsonify({
+            return json_response({
                 "error": {
                     "message": f"LLM provider error: {exc}",
                     "type": "provider_error",
                     "code": 502,
                 },
-                "memory_decision": memory_decision,
+                "memory_decision": _memory_decision(memory_future, cfg.memory_capture_timeout_sec),
             }), 502
 
         if trace_id and semantic_candidates:
-            tracer.record_step(
-                trace_id,
-                "semantic_router",
-                {
-                    "candidates": [
-                        {"tool": candidate.tool, "score": candidate.score}
-                        for candidate in semantic_candidates
-                    ],
-                    "decision": route_decision.__dict__ if route_decision else None,
-                },
-            )
+            tracer.record_step(trace_id, "semantic_router", _semantic_step(semantic_candidates, route_decision))
 
-        return jsonify({
+        return _chat_response({
             "id": "orch_v2_agent",
             "object": "chat.completion",
             "agent": agent.name,
@@ -414,56 +536,45 @@ def register_routes(app) -> Blueprint:
                 "finish_reason": "stop"
             }],
             "request_id": trace_id or getattr(g, "request_id", None),
-            "memory_decision": memory_decision,
-            "route_decision": route_decision.__dict__ if route_decision else None,
-            "model_decision": model_decision.__dict__ if model_decision else None,
+            "memory_decision": _memory_decision(memory_future, cfg.memory_capture_timeout_sec),
+            "route_decision": route_decision,
+            "model_decision": model_decision,
             "tool_result": tool_result,
-        }), 200
+        }, stream)
 
     @app.post("/v1/tools/execute")
     @_limit_route
+    @api_guard
     def tools_execute():
-        if not _api_enabled():
-            return jsonify({"error": {"message": "API disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         payload = request.get_json(force=True, silent=False) or {}
         tool_name = payload.get("name")
         tool_args = payload.get("args") or {}
         approval_token = payload.get("approval_token")
         if not tool_name:
-            return jsonify({"error": {"message": "Tool name required", "type": "validation_error", "code": 400}}), 400
+            return _error_response(_ERR_TOOL_NAME_REQUIRED)
 
-        orchestrator = current_app.config["ORCH_ORCHESTRATOR"]
         result = orchestrator.execute_tool_guarded(
             tool_name,
             tool_args,
             approval_token=approval_token,
+            approval_store=approvals,
             trace_id=getattr(g, "request_id", None),
         )
-        return jsonify({"result": result})
+        return json_response({"result": result})
 
     @app.post("/v1/tools/approve")
     @_limit_route
+    @api_guard
     def tools_approve():
-        if not _api_enabled():
-            return jsonify({"error": {"message": "API disabled", "type": "service_unavailable", "code": 503}}), 503
-        ok, err = require_bearer()
-        if not ok:
-            return jsonify(err), 401
-
         payload = request.get_json(force=True, silent=False) or {}
         tool_name = payload.get("name")
         tool_args = payload.get("args") or {}
         ttl_seconds = payload.get("ttl_seconds")
         if not tool_name:
-            return jsonify({"error": {"message": "Tool name required", "type": "validation_error", "code": 400}}), 400
+            return _error_response(_ERR_TOOL_NAME_REQUIRED)
 
-        approvals = ToolApprovalStore()
         approval = approvals.issue(tool_name, tool_args, ttl_seconds=ttl_seconds)
-        return jsonify({
+        return json_response({
             "approval_id": approval.approval_id,
             "tool": approval.tool_name,
             "args_hash": approval.args_hash,
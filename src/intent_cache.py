@@ -1,24 +1,29 @@
 from __future__ import annotations
 
-import json
+import logging
 import os
 import sqlite3
+import threading
+import time
+import weakref
 from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from src.fast_json import dumps_bytes, loads
 
 DEFAULT_CACHE_DB = "instance/intent_cache.db"
 
+logger = logging.getLogger("orchestrators_v2.intent_cache")
+
 
 @dataclass(frozen=True)
 class IntentCacheEntry:
     policy_hash: str
     signature: str
     decision_json: Dict[str, Any]
-    created_at: str
-    expires_at: str
+    created_at: int
+    expires_at: int
     stable: bool
 
 
@@ -29,98 +34,140 @@ class IntentCache:
         self.ttl_sec = ttl_sec or int(os.getenv("ORCH_INTENT_CACHE_TTL_SEC", "600"))
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._stop_pruning = threading.Event()
         self._init_db()
+        if self.enabled:
+            self._start_pruner()
+
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened once in autocommit mode."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            if os.getenv("ORCH_SQLITE_WAL_ENABLED", "1") == "1":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        self._stop_pruning.set()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _start_pruner(self) -> None:
+        """Delete expired rows every ttl/2 seconds on a daemon thread, off the request path.
+
+        The thread holds only a weak reference, so it exits once the cache is dropped.
+        """
+        interval = max(self.ttl_sec / 2, 1)
+        stop = self._stop_pruning
+        cache_ref = weakref.ref(self)
+
+        def _run() -> None:
+            while not stop.wait(interval):
+                cache = cache_ref()
+                if cache is None:
+                    return
+                try:
+                    cache.prune_expired()
+                except sqlite3.Error as exc:
+                    logger.warning("Intent cache prune failed", extra={"extra": {"error": str(exc)}})
+                del cache
+
+        threading.Thread(target=_run, name="intent-cache-prune", daemon=True).start()
 
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS intent_cache (
-                    policy_hash TEXT NOT NULL,
-                    signature TEXT NOT NULL,
-                    decision_json TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    expires_at TEXT NOT NULL,
-                    stable INTEGER NOT NULL,
-                    PRIMARY KEY (policy_hash, signature)
-                )
-                """
+        conn = self._conn()
+        # Timestamps are epoch seconds. Tables from the ISO-text layout are dropped:
+        # TEXT affinity would store the integers as strings, and rows are disposable.
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(intent_cache)")}
+        if columns and columns.get("expires_at", "").upper() != "INTEGER":
+            conn.execute("DROP TABLE intent_cache")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS intent_cache (
+                policy_hash TEXT NOT NULL,
+                signature TEXT NOT NULL,
+                decision_json BLOB NOT NULL,
+                created_at INTEGER NOT NULL,
+                expires_at INTEGER NOT NULL,
+                stable INTEGER NOT NULL,
+                PRIMARY KEY (policy_hash, signature)
             )
-            conn.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_intent_cache_expires
-                ON intent_cache (expires_at)
-                """
-            )
-            conn.commit()
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_intent_cache_expires
+            ON intent_cache (expires_at)
+            """
+        )
 
     def get(self, policy_hash: str, signature: str) -> Optional[IntentCacheEntry]:
         if not self.enabled:
             return None
-        now = datetime.now(timezone.utc).isoformat()
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
-                """
-                SELECT policy_hash, signature, decision_json, created_at, expires_at, stable
-                FROM intent_cache
-                WHERE policy_hash = ? AND signature = ? AND expires_at > ?
-                """,
-                (policy_hash, signature, now),
-            ).fetchone()
-            if not row:
-                return None
-            return IntentCacheEntry(
-                policy_hash=row["policy_hash"],
-                signature=row["signature"],
-                decision_json=json.loads(row["decision_json"]),
-                created_at=row["created_at"],
-                expires_at=row["expires_at"],
-                stable=bool(row["stable"]),
-            )
+        now = int(time.time())
+        row = self._conn().execute(
+            """
+            SELECT decision_json, created_at, expires_at, stable
+            FROM intent_cache
+            WHERE policy_hash = ? AND signature = ? AND expires_at > ?
+            """,
+            (policy_hash, signature, now),
+        ).fetchone()
+        if not row:
+            return None
+        decision_json, created_at, expires_at, stable = row
+        return IntentCacheEntry(
+            policy_hash=policy_hash,
+            signature=signature,
+            decision_json=loads(decision_json),
+            created_at=created_at,
+            expires_at=expires_at,
+            stable=bool(stable),
+        )
 
     def set(self, policy_hash: str, signature: str, decision: Dict[str, Any], stable: bool) -> None:
         if not self.enabled:
             return
-        created_at = datetime.now(timezone.utc)
-        expires_at = created_at + timedelta(seconds=max(self.ttl_sec, 1))
-        payload = json.dumps(decision, separators=(",", ":"))
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO intent_cache
-                    (policy_hash, signature, decision_json, created_at, expires_at, stable)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    policy_hash,
-                    signature,
-                    payload,
-                    created_at.isoformat(),
-                    expires_at.isoformat(),
-                    1 if stable else 0,
-                ),
-            )
-            conn.commit()
+        created_at = int(time.time())
+        expires_at = created_at + max(self.ttl_sec, 1)
+        payload = dumps_bytes(decision)
+        self._conn().execute(
+            """
+            INSERT OR REPLACE INTO intent_cache
+                (policy_hash, signature, decision_json, created_at, expires_at, stable)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                policy_hash,
+                signature,
+                payload,
+                created_at,
+                expires_at,
+                1 if stable else 0,
+            ),
+        )
 
     def invalidate_policy(self, policy_hash: str) -> None:
         if not self.enabled:
             return
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "DELETE FROM intent_cache WHERE policy_hash = ?",
-                (policy_hash,),
-            )
-            conn.commit()
+        self._conn().execute(
+            "DELETE FROM intent_cache WHERE policy_hash = ?",
+            (policy_hash,),
+        )
 
     def prune_expired(self) -> int:
         if not self.enabled:
             return 0
-        now = datetime.now(timezone.utc).isoformat()
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM intent_cache WHERE expires_at <= ?",
-                (now,),
-            )
-            conn.commit()
-            return cursor.rowcount
\ No newline at end of file
+        now = int(time.time())
+        cursor = self._conn().execute(
+            "DELETE FROM intent_cache WHERE expires_at <= ?",
+            (now,),
+        )
+        return cursor.rowcount
\ No newline at end of file
@@ -4,12 +4,19 @@ import hashlib
 import os
 import re
 import uuid
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Tuple
 
 import yaml
 
-from src.memory import PII_PATTERNS, SECRET_PATTERNS
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
+from src.fast_json import as_dict
+from src.memory import PII_PATTERNS, SECRET_PATTERNS, _alternation
 from src.intent_cache import IntentCache
 from src.hitl_queue import HitlQueue
 from src.policy_engine import compute_policy_hash
@@ -21,8 +28,21 @@ from src.tracer import get_tracer
 
 CONTROL_CHARS_PATTERN = r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]+"
 
+_CTRL_WS_RE = re.compile(rf"(?:{CONTROL_CHARS_PATTERN}|\s)+")
+_SIGNATURE_SCRUB_RE = _alternation(SECRET_PATTERNS + PII_PATTERNS)
+
+
+# Parsed policy + hash per path, reused while (mtime, size, enforce flag) is unchanged.
+_POLICY_CACHE: Dict[str, Tuple[Tuple[int, int, bool], Dict[str, Any], Optional[str]]] = {}
+
 
-@dataclass(frozen=True)
+@lru_cache(maxsize=64)
+def _compile_patterns(patterns: Tuple[str, ...]) -> Tuple[Pattern[str], ...]:
+    """Tier-0 policy patterns, compiled once per distinct pattern list."""
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+
+@dataclass(frozen=True, slots=True)
 class IntentDecision:
     decision_id: str
     policy_hash: Optional[str]
@@ -96,7 +116,7 @@ class IntentRouter:
         self._record_trace(trace_id, tier2)
 
         if tier2.cacheable and not tier2.requires_hitl:
-            self.cache.set(policy_hash or "", signature, tier2.__dict__, stable=True)
+            self.cache.set(policy_hash or "", signature, as_dict(tier2), stable=True)
 
         return tier2
 
@@ -109,14 +129,14 @@ class IntentRouter:
             "Ambiguous intent detected. Human review required.",
         )
 
-        for pattern in deny_patterns:
-            if re.search(pattern, user_input, flags=re.IGNORECASE):
+        for compiled in _compile_patterns(tuple(deny_patterns)):
+            if compiled.search(user_input):
                 return self._decision(
                     tier=0,
                     intent_id=None,
                     confidence=1.0,
                     deny_reason="tier0_deny",
-                    evidence={"rules_matched": [pattern]},
+                    evidence={"rules_matched": [compiled.pattern]},
                     cacheable=False,
                     requires_hitl=False,
                     policy_hash=policy_hash,
@@ -139,14 +159,14 @@ class IntentRouter:
                 tool_params=decision.params,
             )
 
-        for pattern in allow_patterns:
-            if re.search(pattern, user_input, flags=re.IGNORECASE):
+        for compiled in _compile_patterns(tuple(allow_patterns)):
+            if compiled.search(user_input):
                 return self._decision(
                     tier=0,
                     intent_id="allow_pattern",
                     confidence=0.9,
                     deny_reason=None,
-                    evidence={"rules_matched": [pattern]},
+                    evidence={"rules_matched": [compiled.pattern]},
                     cacheable=False,
                     requires_hitl=False,
                     policy_hash=policy_hash,
@@ -234,23 +254,29 @@ class IntentRouter:
             evidence["hitl_request_id"] = hitl_request.request_id
         message = hitl_cfg.get("message") or "Ambiguous intent detected. Human review required."
         evidence["hitl_message"] = message
-        return IntentDecision(
-            **{
-                **decision.__dict__,
-                "deny_reason": decision.deny_reason or "hitl_required",
-                "evidence": evidence,
-                "cacheable": False,
-                "operator": None,
-            }
+        return replace(
+            decision,
+            deny_reason=decision.deny_reason or "hitl_required",
+            evidence=evidence,
+            cacheable=False,
+            operator=None,
         )
 
     def _load_policy(self) -> tuple[Dict[str, Any], Optional[str]]:
-        if not os.path.exists(self.policy_path):
+        try:
+            stat = os.stat(self.policy_path)
+        except OSError:
             return {}, None
+        enforce = os.getenv("ORCH_TOOL_POLICY_ENFORCE", "0") == "1"
+        key = (stat.st_mtime_ns, stat.st_size, enforce)
+        cached = _POLICY_CACHE.get(self.policy_path)
+        if cached and cached[0] == key:
+            return cached[1], cached[2]
         with open(self.policy_path, "rb") as handle:
             raw = handle.read()
-        payload = yaml.safe_load(raw) or {}
-        policy_hash = compute_policy_hash(raw, os.getenv("ORCH_TOOL_POLICY_ENFORCE", "0") == "1")
+        payload = yaml.load(raw, Loader=SafeLoader) or {}
+        policy_hash = compute_policy_hash(raw, enforce)
+        _POLICY_CACHE[self.policy_path] = (key, payload, policy_hash)
         return payload, policy_hash
 
     @staticmethod
@@ -265,19 +291,13 @@ class IntentRouter:
 
     @staticmethod
     def _normalize_input(text: str) -> str:
-        normalized = re.sub(CONTROL_CHARS_PATTERN, " ", text or "")
+        normalized = _CTRL_WS_RE.sub(" ", text or "")
         normalized = IntentRouter._scrub_for_signature(normalized)
-        normalized = re.sub(r"\s+", " ", normalized)
         return normalized.strip().lower()
 
     @staticmethod
     def _scrub_for_signature(text: str) -> str:
-        scrubbed = text
-        for pattern in SECRET_PATTERNS:
-            scrubbed = re.sub(pattern, "[REDACTED]", scrubbed, flags=re.IGNORECASE)
-        for pattern in PII_PATTERNS:
-            scrubbed = re.sub(pattern, "[REDACTED]", scrubbed, flags=re.IGNORECASE)
-        return scrubbed
+        return _SIGNATURE_SCRUB_RE.sub("[REDACTED]", text)
 
     @staticmethod
     def _signature(text: str) -> str:
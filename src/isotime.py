@@ -0,0 +1,22 @@
+"""Fast UTC ISO-8601 timestamps for hot insert paths."""
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=64)
+def _second_prefix(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def utc_iso(ns: Optional[int] = None) -> str:
+    """`datetime.now(timezone.utc).isoformat()` for epoch nanoseconds (default: now).
+
+    Always carries microseconds; the date/time prefix is reused within a second.
+    """
+    if ns is None:
+        ns = time.time_ns()
+    seconds, rem = divmod(ns, 1_000_000_000)
+    return f"{_second_prefix(seconds)}.{rem // 1000:06d}+00:00"
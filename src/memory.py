@@ -5,7 +5,7 @@ import sqlite3
 import uuid
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import text
 
@@ -45,6 +45,18 @@ PII_PATTERNS = [
 ]
 
 CONTROL_CHARS_PATTERN = r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]+"
+
+
+def _alternation(patterns: List[str]) -> "re.Pattern[str]":
+    """One case-insensitive regex matching any of `patterns`, scanned in a single pass."""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+_SECRET_RE = _alternation(SECRET_PATTERNS)
+_PII_RE = _alternation(PII_PATTERNS)
+# Control-character runs and whitespace runs collapse to one space in one pass.
+_CTRL_WS_RE = re.compile(rf"(?:{CONTROL_CHARS_PATTERN}|\s)+")
+
 INTENT_PREFIXES = [
     r"remember this",
     r"remember that",
@@ -71,30 +83,22 @@ def _memory_db_path() -> str:
 def _contains_secret_like(text: str) -> bool:
     if not text:
         return False
-    for pattern in SECRET_PATTERNS:
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            return True
-    return False
+    return _SECRET_RE.search(text) is not None
 
 
 def _redact_sensitive(text: str) -> str:
     if not text:
         return text
-    scrubbed = text
-    for pattern in SECRET_PATTERNS:
-        scrubbed = re.sub(pattern, "[REDACTED]", scrubbed, flags=re.IGNORECASE)
+    scrubbed = _SECRET_RE.sub("[REDACTED]", text)
     if _env_flag("ORCH_MEMORY_SCRUB_REDACT_PII", "1"):
-        for pattern in PII_PATTERNS:
-            scrubbed = re.sub(pattern, "[REDACTED]", scrubbed, flags=re.IGNORECASE)
+        scrubbed = _PII_RE.sub("[REDACTED]", scrubbed)
     return scrubbed
 
 
 def _normalize_text(text: str) -> str:
     if not text:
         return ""
-    normalized = re.sub(CONTROL_CHARS_PATTERN, " ", text)
-    normalized = re.sub(r"\s+", " ", normalized)
-    return normalized.strip()
+    return _CTRL_WS_RE.sub(" ", text).strip()
 
 
 def _strip_intent_prefix(text: str) -> str:
@@ -21,7 +21,7 @@ from src.tracer import (
 from src.tool_registry import ToolRegistry, ToolSpec
 from src.approval_store import ToolApprovalStore, approval_enforced, hash_tool_args
 from src.tools.math import evaluate_expression, SafeMathError
-from src.tools.orch_tokenizer import orch_tokenizer
+from src.tools.orch_tokenizer import count_tokens_cached, orch_tokenizer
 
 
 class Orchestrator:
@@ -624,20 +624,15 @@ class Orchestrator:
             content = str(msg.get("content", "")).strip()
             if not content:
                 continue
-            payload = orch_tokenizer(action="count", text=content)
-            if payload.get("status") == "ok":
-                total += int(payload.get("token_count", 0))
-            else:
-                total += max(1, len(content) // 4)
+            count = count_tokens_cached(content)
+            total += count if count is not None else max(1, len(content) // 4)
         return total
 
     def _count_tokens_for_text(self, text: str) -> int:
         if not text:
             return 0
-        payload = orch_tokenizer(action="count", text=text)
-        if payload.get("status") == "ok":
-            return int(payload.get("token_count", 0))
-        return max(1, len(text) // 4)
+        count = count_tokens_cached(text)
+        return count if count is not None else max(1, len(text) // 4)
 
     @staticmethod
     def _semantic_candidates_from_intent(intent_decision) -> List[SemanticMatch]:
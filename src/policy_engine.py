@@ -9,6 +9,11 @@ from typing import Dict, List, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
 logger = logging.getLogger("orchestrators_v2.policy")
 
 
@@ -40,7 +45,7 @@ class PolicyEngine:
             return cls(rules=[], enforce=enforce, policy_hash=None, policy_path=policy_path)
         with open(policy_path, "rb") as handle:
             raw = handle.read()
-        payload = yaml.safe_load(raw) or {}
+        payload = yaml.load(raw, Loader=SafeLoader) or {}
         rules = payload.get("rules", [])
         policy_hash = compute_policy_hash(raw, enforce)
         return cls(rules=rules, enforce=enforce, policy_hash=policy_hash, policy_path=policy_path)
@@ -11,7 +11,7 @@ from src.router import RouteDecision
 from src.tool_registry import ToolSpec
 
 
-@dataclass
+@dataclass(slots=True)
 class SemanticMatch:
     tool: str
     score: float
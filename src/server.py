@@ -1,4 +1,3 @@
-import hashlib
 import logging
 import os
 import time
@@ -13,7 +12,7 @@ from flask_limiter.util import get_remote_address
 from src.orchestrator import Orchestrator
 from src.observability import init_otel, get_current_trace_context, get_current_traceparent
 from src.tracer import configure_tracer_metrics
-from src.http_routes import register_routes
+from src.http_routes import _user_id_hash, register_routes
 
 load_dotenv()
 
@@ -50,7 +49,7 @@ ORCH_ENV = os.getenv("ORCH_ENV", "development").lower()
 def _rate_limit_key() -> str:
     auth_header = request.headers.get("Authorization", "")
     if auth_header.startswith("Bearer "):
-        return hashlib.sha256(auth_header.encode()).hexdigest()[:16]
+        return _user_id_hash()
     return get_remote_address()
 
 
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import importlib.util
 import math
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 DEFAULT_TOKENIZER_DIR = str(
@@ -13,6 +16,12 @@ DEFAULT_TOKENIZER_DIR = str(
 )
 DEFAULT_SAFETY_MARGIN = float(os.getenv("ORCH_TOKEN_SAFETY_MARGIN", "1.1"))
 
+# Token counts keyed by (blake2b digest of text, model); digests keep long
+# histories from being pinned in memory by the cache.
+_COUNT_CACHE_SIZE = int(os.getenv("ORCH_TOKEN_COUNT_CACHE_SIZE", "4096"))
+_COUNT_CACHE: "OrderedDict[Tuple[bytes, str], int]" = OrderedDict()
+_COUNT_CACHE_LOCK = threading.Lock()
+
 
 class _ByteFallbackTokenizer:
     """Minimal byte-level tokenizer used when tiktoken isn't available."""
@@ -182,3 +191,26 @@ def orch_tokenizer(
             "error": "detokenize_failed",
             "message": str(exc),
         }
+
+
+def count_tokens_cached(text: str, model_name: str = "gpt-aimee") -> Optional[int]:
+    """Memoized ``orch_tokenizer(action="count")``; None when counting failed.
+
+    Failures are not cached so a tokenizer that becomes available is picked up.
+    """
+    key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), model_name)
+    with _COUNT_CACHE_LOCK:
+        count = _COUNT_CACHE.get(key)
+        if count is not None:
+            _COUNT_CACHE.move_to_end(key)
+            return count
+
+    payload = orch_tokenizer(action="count", text=text, model_name=model_name)
+    if payload.get("status") != "ok":
+        return None
+    count = int(payload.get("token_count", 0))
+    with _COUNT_CACHE_LOCK:
+        _COUNT_CACHE[key] = count
+        if len(_COUNT_CACHE) > _COUNT_CACHE_SIZE:
+            _COUNT_CACHE.popitem(last=False)
+    return count
@@ -5,7 +5,7 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import text
 
@@ -26,6 +26,9 @@ from src.db import get_engine
 TRACE_ENABLED = os.getenv("ORCH_TRACE_ENABLED", "1") == "1"
 DEFAULT_TRACE_DB = os.getenv("ORCH_TRACE_DB_PATH", "instance/trace.db")
 
+# Serves the newest-first listings in reports and the trust panel.
+TRACES_CREATED_AT_INDEX = "CREATE INDEX IF NOT EXISTS idx_traces_created_at ON traces(created_at DESC)"
+
 OTEL_TRACE_STEP_KEYS = {
     "decision",
     "reason",
@@ -87,6 +90,7 @@ class TraceStore:
                     )
                 )
                 self._ensure_trace_steps_schema(conn)
+                conn.execute(text(TRACES_CREATED_AT_INDEX))
             return
 
         with self._get_conn() as conn:
@@ -100,6 +104,7 @@ class TraceStore:
                 """
             )
             self._ensure_trace_steps_schema(conn)
+            conn.execute(TRACES_CREATED_AT_INDEX)
             conn.commit()
 
     def _get_conn(self) -> sqlite3.Connection:
@@ -224,6 +229,52 @@ class TraceStore:
 
         self._emit_otel_span(trace_id, step_type, created_at, payload)
 
+    def record_steps(self, trace_id: str, steps: List[Dict[str, Any]]) -> None:
+        """Record several ``{"step_type", "payload"}`` steps in one transaction."""
+        if not self.enabled or not steps:
+            return
+        created_at = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for step in steps:
+            payload = dict(step["payload"])
+            self._inject_otel_context(payload)
+            rows.append((step["step_type"], payload))
+
+        if self.engine:
+            with self.engine.begin() as conn:
+                self._ensure_trace_steps_schema(conn)
+                conn.execute(
+                    text(
+                        """
+                        INSERT INTO trace_steps (trace_id, step_type, step_json, created_at)
+                        VALUES (:trace_id, :step_type, :step_json, :created_at)
+                        """
+                    ),
+                    [
+                        {
+                            "trace_id": trace_id,
+                            "step_type": step_type,
+                            "step_json": json.dumps(payload),
+                            "created_at": created_at,
+                        }
+                        for step_type, payload in rows
+                    ],
+                )
+        else:
+            with self._get_conn() as conn:
+                self._ensure_trace_steps_schema(conn)
+                conn.executemany(
+                    """
+                    INSERT INTO trace_steps (trace_id, step_type, step_json, created_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    [(trace_id, step_type, json.dumps(payload), created_at) for step_type, payload in rows],
+                )
+                conn.commit()
+
+        for step_type, payload in rows:
+            self._emit_otel_span(trace_id, step_type, created_at, payload)
+
     def record_memory_write_decision(self, trace_id: str, **payload: Any) -> None:
         if not self.enabled or not trace_id:
             return
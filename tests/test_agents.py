@@ -0,0 +1,32 @@
+import os
+
+from src import agents
+
+
+def _write_agent(path, name, prompt, mtime_ns):
+    path.write_text(f"name: {name}\nsystem_prompt: {prompt}\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_agent_profiles_cached_until_files_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("ORCH_AGENT_DIR", str(tmp_path))
+    _write_agent(tmp_path / "a.yaml", "Alpha", "first", 1_000_000_000)
+
+    loads = []
+    original = agents._load_agent_file
+    monkeypatch.setattr(agents, "_load_agent_file", lambda path: loads.append(path) or original(path))
+
+    assert agents.get_agent("alpha").system_prompt == "first"
+    assert [a["name"] for a in agents.list_agents()] == ["Alpha"]
+    assert agents.get_agent("ALPHA").system_prompt == "first"
+    assert len(loads) == 1
+
+    _write_agent(tmp_path / "a.yaml", "Alpha", "second", 2_000_000_000)
+    assert agents.get_agent("alpha").system_prompt == "second"
+    assert len(loads) == 2
+
+    _write_agent(tmp_path / "b.yml", "Beta", "other", 3_000_000_000)
+    os.utime(tmp_path, ns=(4_000_000_000, 4_000_000_000))
+    assert [a["name"] for a in agents.list_agents()] == ["Alpha", "Beta"]
+    assert len(loads) == 3
+    assert agents.get_agent("missing") is None
@@ -54,3 +54,14 @@ def test_killer_demo_runs_offline_and_creates_receipt():
     assert receipt_path.exists()
     payload = json.loads(receipt_path.read_text())
     assert "assistant_content" in payload
+
+
+def test_heuristic_intent_keeps_calc_priority():
+    from src.demo_mode import _heuristic_intent
+
+    assert _heuristic_intent("please ECHO then Calc 2+2") == "safe_calc"
+    assert _heuristic_intent("Echo this") == "echo"
+    assert _heuristic_intent("recalculate") == "safe_calc"
+    assert _heuristic_intent("  hello ") == "chat"
+    assert _heuristic_intent("   ") == "unknown"
+    assert _heuristic_intent(None) == "unknown"
@@ -123,3 +123,33 @@ def test_intent_router_tier2_hitl_queue(tmp_path, monkeypatch):
     assert decision.requires_hitl is True
     assert decision.deny_reason in {"hitl_low_confidence", "hitl_ambiguous", "hitl_required"}
     assert decision.evidence.get("hitl_message") == "HITL required"
+
+
+def test_intent_router_policy_reparsed_only_on_change(tmp_path, monkeypatch):
+    policy_path = _write_policy(tmp_path, {"policy": {"intent_router": {"tier0": {"deny_patterns": ["drop table"]}}}})
+    os.utime(policy_path, ns=(1_000_000_000, 1_000_000_000))
+    monkeypatch.setenv("ORCH_TOOL_POLICY_ENFORCE", "0")
+
+    parses = []
+    original = yaml.load
+    monkeypatch.setattr("src.intent_router.yaml.load", lambda raw, Loader: parses.append(raw) or original(raw, Loader))
+
+    semantic_router = StubSemanticRouter(RouteDecision(tool=None, params={}, confidence=0.0, reason="no_match"), [])
+    router = IntentRouter(
+        RuleRouter(),
+        semantic_router,
+        IntentCache(db_path=str(tmp_path / "intent_cache.db")),
+        HitlQueue(db_path=str(tmp_path / "hitl_queue.db")),
+        str(policy_path),
+        enabled=True,
+    )
+
+    assert router.route("DROP TABLE users").deny_reason == "tier0_deny"
+    assert router.route("drop table again").deny_reason == "tier0_deny"
+    assert len(parses) == 1
+
+    _write_policy(tmp_path, {"policy": {"intent_router": {"tier0": {"deny_patterns": ["rm -rf"]}}}})
+    os.utime(policy_path, ns=(2_000_000_000, 2_000_000_000))
+    assert router.route("drop table users").deny_reason != "tier0_deny"
+    assert router.route("rm -rf /").deny_reason == "tier0_deny"
+    assert len(parses) == 2
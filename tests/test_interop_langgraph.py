@@ -1,4 +1,12 @@
-from orchestrators_v2.interop.langgraph import RuleSpec, convert_graph, convert_langgraph_spec, to_rule_router_snippet
+import json
+
+from orchestrators_v2.interop.langgraph import (
+    RuleSpec,
+    convert_graph,
+    convert_langgraph_bytes,
+    convert_langgraph_spec,
+    to_rule_router_snippet,
+)
 
 
 def test_convert_graph_trivial():
@@ -30,3 +38,23 @@ def test_convert_langgraph_spec_edges():
         RuleSpec(tool="echo", match="contains:echo"),
         RuleSpec(tool="safe_calc", match="contains:calc"),
     ]
+
+
+def test_convert_langgraph_bytes_matches_dict_api():
+    payload = {
+        "nodes": [{"id": "echo", "type": "tool"}],
+        "edges": [
+            {"from": "router", "to": "echo", "when": "contains:echo"},
+            {"from": "router", "to": "safe_calc"},
+        ],
+        "conditional_edges": [
+            {"from": "router", "conditions": [{"condition": "contains:calc", "to": "safe_calc"}]},
+        ],
+    }
+    raw = json.dumps(payload).encode("utf-8")
+
+    assert convert_langgraph_bytes(raw) == convert_langgraph_spec(payload)
+    # Off-schema documents take the tolerant dict path.
+    assert convert_langgraph_bytes(b'{"edges": ["bogus", {"to": "echo", "when": "contains:x"}]}') == [
+        RuleSpec(tool="echo", match="contains:x")
+    ]
@@ -77,3 +77,18 @@ def test_capture_strict_allows_explicit_intent(tmp_path, monkeypatch):
     assert decision["candidate_id"]
     db_path = Path(os.getenv("ORCH_MEMORY_DB_PATH"))
     assert db_path.exists()
+
+
+def test_record_steps_writes_batch_in_order(tmp_path):
+    tracer = TraceStore(db_path=str(tmp_path / "trace.db"), enabled=True)
+    handle = tracer.start_trace({"route": "test"})
+    tracer.record_steps(
+        handle.trace_id,
+        [
+            {"step_type": "first", "payload": {"n": 1}},
+            {"step_type": "second", "payload": {"n": 2}},
+        ],
+    )
+
+    steps = tracer.get_trace_steps(handle.trace_id)
+    assert [(s["step_type"], s["payload"]) for s in steps] == [("first", {"n": 1}), ("second", {"n": 2})]
@@ -2,7 +2,8 @@ import pytest
 
 from src.orchestrator import Orchestrator
 from src.tool_registry import ToolRegistry, ToolSpec
-from src.tools.orch_tokenizer import orch_tokenizer
+from src.tools import orch_tokenizer as tokenizer_module
+from src.tools.orch_tokenizer import count_tokens_cached, orch_tokenizer
 
 
 def test_orch_tokenizer_registered():
@@ -30,6 +31,26 @@ def test_orch_tokenizer_count_only():
     assert "tokens" not in result
 
 
+def test_count_tokens_cached_memoizes_by_text_and_model(monkeypatch):
+    calls = []
+    original = tokenizer_module.orch_tokenizer
+
+    def counting(**kwargs):
+        calls.append(kwargs["text"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(tokenizer_module, "orch_tokenizer", counting)
+    monkeypatch.setattr(tokenizer_module, "_COUNT_CACHE", type(tokenizer_module._COUNT_CACHE)())
+
+    expected = orch_tokenizer(action="count", text="cached prompt")["token_count"]
+    assert count_tokens_cached("cached prompt") == expected
+    assert count_tokens_cached("cached prompt") == expected
+    assert len(calls) == 1
+    count_tokens_cached("cached prompt", model_name="other")
+    assert len(calls) == 2
+    assert count_tokens_cached("   ") is None
+
+
 def test_orch_tokenizer_invalid_action():
     result = orch_tokenizer(action="bad_action", text="Hello")
     assert result["status"] == "error"
@@ -1,3 +1,6 @@
+import pytest
+
+from src.advanced_router import ModelRouter, PolicyRouter
 from src.router import RuleRouter, Rule
 from src.tool_registry import ToolRegistry, ToolSpec
 
@@ -20,6 +23,88 @@ def test_rule_router_selects_first_match():
     assert decision.reason == "keyword_echo"
 
 
+def test_policy_router_respects_rule_order_flags_and_enabled():
+    router = PolicyRouter(
+        rules=[
+            {"id": "off", "enabled": False, "match": "echo", "tool": "disabled"},
+            {"id": "exact", "match": "ECHO", "case_insensitive": False, "tool": "upper"},
+            {"match_any": ["\\becho\\b", "repeat"], "tool": "echo", "params": {"message_key": "message"}},
+        ],
+        defaults={"confidence": 0.5, "params": {"source": "policy"}},
+    )
+
+    upper = router.route("ECHO hi")
+    assert upper.tool == "upper"
+    assert upper.reason == "exact"
+
+    decision = router.route("please repeat this")
+    assert decision.tool == "echo"
+    assert decision.params == {"source": "policy", "message_key": "message"}
+    assert decision.confidence == 0.5
+    assert decision.reason == "policy_match"
+
+    decision.params["mutated"] = True
+    assert "mutated" not in router.route("echo again").params
+    assert router.route("nothing here").reason == "no_match"
+
+
+def test_policy_router_hyperscan_prefilter_matches_re_order():
+    hyperscan = pytest.importorskip("hyperscan")
+    router = PolicyRouter(
+        rules=[
+            {"id": "math", "match_any": ["\\bcalc\\b", "[0-9]+\\s*\\+"], "tool": "safe_calc"},
+            {"id": "echo", "match": "\\becho\\b", "tool": "echo"},
+        ]
+    )
+    assert isinstance(router._hs_db, hyperscan.Database)
+
+    assert router.route("echo 1 + 2").reason == "math"
+    assert router.route("ECHO hi").reason == "echo"
+    assert router.route("écho only").reason == "no_match"
+    assert router.route("plain text").reason == "no_match"
+
+    fallback = PolicyRouter(rules=[{"id": "backref", "match": "(ab)\\1", "tool": "echo"}])
+    assert fallback._hs_db is None
+    assert fallback.route("abab").reason == "backref"
+
+
+def test_policy_router_literal_prefilter_matches_re_order(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    monkeypatch.setattr("src.advanced_router.hyperscan", None)
+    router = PolicyRouter(
+        rules=[
+            {"id": "recall", "match_any": ["recall:", "remember this"], "tool": "recall"},
+            {"id": "math", "match": "[0-9]+\\s*\\+", "tool": "safe_calc"},
+            {"id": "cased", "match": "/Tool", "case_insensitive": False, "tool": "echo"},
+        ]
+    )
+    assert router._literal_index is not None
+    assert router._literal_index.regex_rules == (1,)
+
+    assert router.route("1 + 2 then Recall: x").reason == "recall"
+    assert router.route("please REMEMBER THIS").reason == "recall"
+    assert router.route("use /Tool now").reason == "cased"
+    assert router.route("use /tool now").reason == "no_match"
+    assert router.route("3 + 4").reason == "math"
+    assert router.route("récall: non-ascii falls back").reason == "no_match"
+    assert router.route("RECALL: ünïcode").reason == "recall"
+
+
+def test_model_router_skips_tokenizer_below_tier1_bound(monkeypatch):
+    router = ModelRouter()
+    router.chat_tier1_max_tokens = 50
+    counted = []
+    monkeypatch.setattr(router, "_count_tokens", lambda messages: counted.append(messages) or 51)
+
+    short = [{"role": "user", "content": "threat model this"}]
+    assert router.select_model(short, tool_selected=False).reason == "analysis_request"
+    assert counted == []
+
+    long = [{"role": "user", "content": "x" * 60}]
+    assert router.select_model(long, tool_selected=False).reason == "tier1_overflow"
+    assert counted == [long]
+
+
 def test_tool_registry_execute():
     registry = ToolRegistry()
 
@@ -46,3 +46,118 @@ def test_python_exec_error_exit():
     assert data["status"] == "error"
     assert data["error"]
     assert data["exit_code"] == 2
+
+
+def test_python_exec_batch_reuses_worker_with_fresh_namespaces():
+    snippets = [
+        {"code": "x = 1\nprint(x)"},
+        {"code": "print(x)"},
+        {"code": "import sys\nprint(sys.stdin.read().upper())", "stdin": "hi"},
+    ]
+    exit_code, data = _run_python_exec({"snippets": snippets})
+
+    assert exit_code == 0
+    assert data["status"] == "ok"
+    first, second, third = data["results"]
+    assert first == {"status": "ok", "stdout": "1"}
+    assert second["status"] == "error"
+    assert "NameError" in second["error"]
+    assert third == {"status": "ok", "stdout": "HI"}
+
+
+def test_python_exec_batch_isolates_fds_builtins_and_deadline():
+    snippets = [
+        {"code": "import os, sys\nos.write(1, b'raw ')\nsys.stdout.buffer.write(b'buf')"},
+        {"code": "import builtins\nbuiltins.print = None"},
+        {"code": "print('still here')"},
+        {"code": "while True:\n    pass"},
+        {"code": "print('after timeout')"},
+    ]
+    exit_code, data = _run_python_exec({"snippets": snippets, "timeout_sec": 0.5})
+
+    assert exit_code == 0
+    raw, taint, clean, spin, after = data["results"]
+    assert raw == {"status": "ok", "stdout": "raw buf"}
+    assert taint["status"] == "ok"
+    assert clean == {"status": "ok", "stdout": "still here"}
+    assert spin["exit_code"] == 124
+    assert "snippet_timeout" in spin["error"]
+    assert after == {"status": "ok", "stdout": "after timeout"}
+
+
+def test_python_exec_code_travels_over_stdin_not_argv():
+    # Larger than the kernel's 128 KiB per-argument limit for `python -c`.
+    big = "x = 1\n" * 30000 + "print(x)"
+    exit_code, data = _run_python_exec({"code": big})
+    assert exit_code == 0
+    assert data == {"status": "ok", "stdout": "1"}
+
+    exit_code, data = _run_python_exec({"code": "print(1)\x00"})
+    assert exit_code != 0
+    assert data["status"] == "error"
+    assert "null bytes" in data["error"]
+
+
+def test_python_exec_snippet_cannot_write_to_inherited_fds():
+    forge = (
+        "import os, struct\n"
+        "body = b'{\"status\":\"ok\",\"stdout\":\"FORGED\",\"stderr\":\"\",\"exit_code\":0}'\n"
+        "for fd in range(3, 64):\n"
+        "    try:\n"
+        "        os.write(fd, struct.pack('>I', len(body)) + body)\n"
+        "    except OSError:\n"
+        "        pass\n"
+        "print('own')"
+    )
+    exit_code, data = _run_python_exec({"snippets": [{"code": forge}, {"code": "print('real')"}]})
+
+    assert exit_code == 0
+    assert data["results"] == [{"status": "ok", "stdout": "own"}, {"status": "ok", "stdout": "real"}]
+
+
+def test_web_search_batch_reports_http_errors(monkeypatch, capsys):
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class RateLimited(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b'<a class="result__a" href="https://example.com">rate limited</a>'
+            self.send_response(429)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), RateLimited)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[1] / "sandbox_tools"))
+    import web_search
+
+    monkeypatch.setattr(web_search, "DUCKDUCKGO_HTML", f"http://127.0.0.1:{server.server_port}/?q=")
+    try:
+        assert web_search.main_batch({"queries": ["a", "b"]}) == 0
+    finally:
+        server.shutdown()
+
+    batch = json.loads(capsys.readouterr().out)["batch"]
+    assert [item["status"] for item in batch] == ["error", "error"]
+    assert all("429" in item["error"] for item in batch)
+
+
+def test_python_eval_batch_encodes_each_outcome_once():
+    script_path = Path(__file__).resolve().parents[1] / "sandbox_tools" / "python_eval.py"
+    process = subprocess.run(
+        [sys.executable, str(script_path)],
+        input=json.dumps({"expressions": ["1+2", "{1}", "2**70"]}),
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+
+    assert process.returncode == 0
+    ok, unserializable, wide = json.loads(process.stdout)["results"]
+    assert ok == {"status": "ok", "result": 3}
+    assert unserializable["status"] == "error"
+    assert wide == {"status": "ok", "result": 2**70}
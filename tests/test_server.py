@@ -86,3 +86,101 @@ def test_production_requires_bearer(monkeypatch):
             headers={'Authorization': 'Bearer testtoken'}
         )
         assert ok.status_code == 200
+
+
+def test_agent_chat_endpoint(monkeypatch):
+    from src.server import create_app
+
+    monkeypatch.setenv("ORCH_ENV", "development")
+    monkeypatch.setenv("ORCH_REQUIRE_BEARER", "0")
+    monkeypatch.setenv("ORCH_RATE_LIMIT_ENABLED", "0")
+
+    app = create_app()
+    with app.test_client() as client:
+        response = client.post(
+            '/v1/agents/holly/chat',
+            json={'messages': [{'role': 'user', 'content': 'hello'}]},
+        )
+        assert response.status_code == 200
+        assert response.get_json()['choices'][0]['message']['role'] == 'assistant'
+
+
+def test_chat_completions_streams_sse_chunks(monkeypatch):
+    import json
+
+    from src.server import create_app
+
+    monkeypatch.setenv("ORCH_ENV", "development")
+    monkeypatch.setenv("ORCH_REQUIRE_BEARER", "0")
+    monkeypatch.setenv("ORCH_RATE_LIMIT_ENABLED", "0")
+
+    app = create_app()
+    with app.test_client() as client:
+        response = client.post(
+            '/v1/chat/completions',
+            json={'messages': [{'role': 'user', 'content': 'hello'}], 'stream': True},
+        )
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        events = [line[len('data: '):] for line in response.get_data(as_text=True).split('\n\n') if line]
+        assert events[-1] == '[DONE]'
+        first, closing = json.loads(events[0]), json.loads(events[1])
+        assert first['object'] == 'chat.completion.chunk'
+        assert first['choices'][0]['delta']['role'] == 'assistant'
+        assert closing['choices'][0]['finish_reason'] == 'stop'
+        assert 'memory_decision' in closing
+
+
+def test_json_provider_matches_stdlib_semantics(monkeypatch):
+    from datetime import datetime
+
+    from flask import jsonify, request
+
+    from src.server import create_app
+
+    monkeypatch.setenv("ORCH_ENV", "development")
+    monkeypatch.setenv("ORCH_REQUIRE_BEARER", "0")
+
+    app = create_app()
+    body = '{"big": 123456789012345678901234567890}'
+    with app.test_request_context('/', method='POST', data=body, content_type='application/json'):
+        assert request.get_json()["big"] == 123456789012345678901234567890
+        assert jsonify({"d": datetime(2026, 1, 1)}).get_json()["d"] == "Thu, 01 Jan 2026 00:00:00 GMT"
+
+
+def test_user_id_hash_is_memoized_per_request_only():
+    """The Authorization digest lives on `g` for one request, not in a process-wide cache."""
+    import hashlib
+    from flask import Flask, g
+    from src.http_routes import _user_id_hash
+
+    app = Flask(__name__)
+    with app.test_request_context(headers={"Authorization": "Bearer secret"}):
+        assert _user_id_hash() == hashlib.sha256(b"Bearer secret").hexdigest()[:16]
+        assert g.user_id_hash == _user_id_hash()
+    with app.test_request_context():
+        assert _user_id_hash() == "anonymous"
+    assert not hasattr(_user_id_hash, "cache_info")
+
+
+def test_chat_completions_does_not_wait_on_hung_memory_capture(monkeypatch):
+    import threading
+
+    from src import http_routes
+    from src.server import create_app
+
+    monkeypatch.setenv("ORCH_ENV", "development")
+    monkeypatch.setenv("ORCH_REQUIRE_BEARER", "0")
+    monkeypatch.setenv("ORCH_RATE_LIMIT_ENABLED", "0")
+    monkeypatch.setenv("ORCH_MEMORY_CAPTURE_TIMEOUT_SEC", "0.05")
+    release = threading.Event()
+    monkeypatch.setattr(http_routes, "evaluate_memory_capture", lambda **_: release.wait(5))
+
+    app = create_app()
+    try:
+        with app.test_client() as client:
+            response = client.post('/v1/chat/completions', json={'messages': [{'role': 'user', 'content': 'hello'}]})
+    finally:
+        release.set()
+    assert response.status_code == 200
+    assert response.get_json()['memory_decision']['decision'] == 'pending'
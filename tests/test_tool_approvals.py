@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 
 from src.approval_store import ToolApprovalStore, hash_tool_args
@@ -64,3 +65,78 @@ def test_tool_approval_args_hash_mismatch(tmp_path):
     )
     assert approved is False
     assert reason == "args_hash_mismatch"
+
+
+def test_tool_approval_expiry_migrates_and_purges(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "tool_approvals.db"
+    expired_at = (datetime.now(timezone.utc) - timedelta(seconds=10)).isoformat()
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute(
+            """
+            CREATE TABLE tool_approvals (
+                approval_id TEXT PRIMARY KEY, tool_name TEXT NOT NULL, args_hash TEXT NOT NULL,
+                created_at TEXT NOT NULL, expires_at TEXT NOT NULL, consumed_at TEXT,
+                status TEXT NOT NULL, metadata_json TEXT
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO tool_approvals VALUES ('legacy', 'echo', 'h', ?, ?, NULL, 'pending', '{}')",
+            (expired_at, expired_at),
+        )
+        conn.commit()
+
+    store = ToolApprovalStore(db_path=str(db_path))
+    _, reason, _ = store.validate_and_consume("legacy", "echo", "h")
+    assert reason == "expired"
+
+    fresh = store.issue("echo", {"message": "hi"}, ttl_seconds=60)
+    assert store.purge_expired() == 1
+    approved, _, _ = store.validate_and_consume(fresh.approval_id, "echo", fresh.args_hash)
+    assert approved is True
+
+
+
+def test_tool_approval_rows_without_expires_at_ms_fail_closed(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "tool_approvals.db"
+    store = ToolApprovalStore(db_path=str(db_path))
+    # Written after the store's migration ran, by a writer unaware of expires_at_ms.
+    with sqlite3.connect(str(db_path)) as conn:
+        for approval_id, expires_at in (("stale", "2020-01-01T00:05:00+00:00"), ("garbled", "not-a-date")):
+            conn.execute(
+                "INSERT INTO tool_approvals (approval_id, tool_name, args_hash, created_at, expires_at, status) "
+                "VALUES (?, 'echo', 'h', ?, ?, 'pending')",
+                (approval_id, expires_at, expires_at),
+            )
+        conn.commit()
+
+    assert store.validate_and_consume("stale", "echo", "h")[:2] == (False, "expired")
+    assert store.validate_and_consume("garbled", "echo", "h")[:2] == (False, "expired")
+    assert store.purge_expired() == 2
+
+def test_tool_approval_issue_many(tmp_path):
+    store = ToolApprovalStore(db_path=str(tmp_path / "tool_approvals.db"))
+    approvals = store.issue_many(
+        [("echo", {"message": str(i)}, 60, {"batch": True}) for i in range(3)]
+    )
+
+    assert len({approval.approval_id for approval in approvals}) == 3
+    for i, approval in enumerate(approvals):
+        assert approval.args_hash == hash_tool_args({"message": str(i)})
+        approved, _, _ = store.validate_and_consume(approval.approval_id, "echo", approval.args_hash)
+        assert approved is True
+
+
+def test_hash_tool_args_pinned_to_stdlib_canonical_json():
+    # Pinned digests: the hash must not change with the installed JSON backend.
+    assert hash_tool_args({"q": "café"}) == "8dff564f95bb0c15ed217d0a43ebc2a22025b20d94f724ebb0c41709b4f2a842"
+    assert hash_tool_args({"n": 1e16, "f": 0.1}) == "de68f723515ca78f785b3bc11d18a4942aa30334aaa679d374cecfa7aa291d4e"
+    assert (
+        hash_tool_args({"t": datetime(2026, 1, 1, tzinfo=timezone.utc)})
+        == "bb058af763f3a7a739c625417dddf068d58a3daad2cfc51f7c8ee3a4cf4b905b"
+    )
+    assert hash_tool_args({}) == hash_tool_args(None) == hashlib.sha256(b"{}").hexdigest()